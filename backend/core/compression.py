@@ -0,0 +1,191 @@
+# core/compression.py - Response Compression Middleware
+from typing import Callable, Dict, Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# zstd and Brotli are optional - without them responses fall back to gzip
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Bodies at least this large are compressed in a worker thread so the event
+# loop is not blocked (both zstandard and brotli release the GIL)
+THREADED_COMPRESSION_MIN_SIZE = 256 * 1024
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Parse an Accept-Encoding header into the set of acceptable codings"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+class _StreamCompressor:
+    """Uniform streaming interface over zstd and Brotli compressors"""
+
+    def __init__(self, encoding: str, zstd_level: int, brotli_quality: int):
+        if encoding == "zstd":
+            self._zstd = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self._brotli = None
+        else:
+            self._zstd = None
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it right away"""
+        if self._zstd is not None:
+            return self._zstd.compress(data) + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._brotli.process(data) + self._brotli.flush()
+
+    def finish(self) -> bytes:
+        if self._zstd is not None:
+            return self._zstd.flush()
+        return self._brotli.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with zstd or Brotli when the client accepts them,
+    falling back to Starlette's gzip middleware otherwise
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        zstd_level: int = 3,
+        brotli_quality: int = 4,
+        gzip_level: int = 9
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.zstd_level = zstd_level
+        self.brotli_quality = brotli_quality
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=gzip_level)
+
+        self._one_shot: Dict[str, Callable[[bytes], bytes]] = {}
+        if HAS_ZSTD:
+            # ZstdCompressor instances are not thread-safe, and large bodies are
+            # compressed on worker threads, so each body gets its own compressor
+            self._one_shot["zstd"] = lambda body: zstandard.ZstdCompressor(level=zstd_level).compress(body)
+        if HAS_BROTLI:
+            self._one_shot["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        accept_encoding = Headers(scope=scope).get("Accept-Encoding", "")
+        if not accept_encoding:
+            return None
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("zstd", "br"):
+            if encoding in self._one_shot and encoding in accepted:
+                return encoding
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = self._choose_encoding(scope)
+            if encoding:
+                responder = _CompressionResponder(self, encoding, send)
+                await self.app(scope, receive, responder.send)
+                return
+        await self.gzip(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Rewrites a single response, compressing its body with the chosen encoding"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def _compress_body(self, body: bytes) -> bytes:
+        compress = self.middleware._one_shot[self.encoding]
+        if len(body) >= THREADED_COMPRESSION_MIN_SIZE:
+            return await anyio.to_thread.run_sync(compress, body)
+        return compress(body)
+
+    def _set_encoding_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        return headers
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers back until we know whether the body gets compressed
+            self.initial_message = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.middleware.minimum_size and not more_body):
+                # Already encoded, or too small to be worth compressing
+                self.passthrough = True
+                await self._send(self.initial_message)
+                await self._send(message)
+            elif not more_body:
+                body = await self._compress_body(body)
+                headers = self._set_encoding_headers()
+                headers["Content-Length"] = str(len(body))
+                message["body"] = body
+                await self._send(self.initial_message)
+                await self._send(message)
+            else:
+                # First chunk of a streaming response
+                headers = self._set_encoding_headers()
+                del headers["Content-Length"]
+                self.stream = _StreamCompressor(
+                    self.encoding, self.middleware.zstd_level, self.middleware.brotli_quality
+                )
+                message["body"] = self.stream.compress(body)
+                await self._send(self.initial_message)
+                await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        # Remaining chunks of a streaming response
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        message["body"] = chunk
+        await self._send(message)
@@ -1,7 +1,8 @@
 # core/config.py - Application Configuration
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import List
+from typing import Any, Dict, List
+from functools import lru_cache
 import os
 
 
@@ -23,15 +24,30 @@ class Settings(BaseSettings):
 
     # AI/ML
     AI_MODEL_NAME: str = Field(default="google/flan-t5-small", env="AI_MODEL_NAME")
+    # Model revision to load (branch, tag or commit hash); pin a commit hash so
+    # persisted AI results are retired exactly when the weights change
+    AI_MODEL_REVISION: str = Field(default="main", env="AI_MODEL_REVISION")
     ENABLE_AI_PROCESSING: bool = Field(default=True, env="ENABLE_AI_PROCESSING")
+    # Load the model at startup instead of on the first name that needs it
+    AI_EAGER_LOAD: bool = Field(default=False, env="AI_EAGER_LOAD")
+    # Classify sample values with Hyperscan (if installed) instead of `re`
+    USE_HYPERSCAN: bool = Field(default=False, env="USE_HYPERSCAN")
 
     # File Processing
     MAX_FILE_SIZE_MB: int = Field(default=50, env="MAX_FILE_SIZE_MB")
     MAX_RECORDS_DISPLAY: int = Field(default=1000, env="MAX_RECORDS_DISPLAY")
+    # Parse CSV uploads with Polars (if installed) instead of pandas
+    USE_POLARS: bool = Field(default=False, env="USE_POLARS")
+    # Shrink parsed columns to the smallest integer types and categoricals
+    DOWNCAST_DTYPES: bool = Field(default=False, env="DOWNCAST_DTYPES")
+    # Store text columns as Arrow strings (if pyarrow is installed) for native string kernels
+    ARROW_STRINGS: bool = Field(default=False, env="ARROW_STRINGS")
 
     # Caching
     ENABLE_CACHING: bool = Field(default=True, env="ENABLE_CACHING")
     CACHE_TTL_SECONDS: int = Field(default=300, env="CACHE_TTL_SECONDS")
+    # Directory for caches that persist across restarts (e.g. AI model outputs)
+    CACHE_DIR: str = Field(default=".cache", env="CACHE_DIR")
 
     # Logging
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
@@ -40,39 +56,36 @@ class Settings(BaseSettings):
     # ✅ Pydantic v2 way of handling config
     model_config = {
         "env_file": ".env",
-        "case_sensitive": True
+        "case_sensitive": True,
+        "frozen": True
     }
 
-
-# Create global settings instance
-settings = Settings()
-
-
-# Environment-specific configurations
-class DevelopmentConfig(Settings):
-    DEBUG: bool = True
-    LOG_LEVEL: str = "DEBUG"
-
-
-class ProductionConfig(Settings):
-    DEBUG: bool = False
-    LOG_LEVEL: str = "WARNING"
-    ALLOWED_HOSTS: List[str] = ["yourdomain.com", "api.yourdomain.com"]
-
-
-class TestingConfig(Settings):
-    DEBUG: bool = True
-    LOG_LEVEL: str = "DEBUG"
-    ENABLE_AI_PROCESSING: bool = False  # Disable AI for faster testing
+    @classmethod
+    def settings_customise_sources(cls, settings_cls, init_settings, env_settings,
+                                   dotenv_settings, file_secret_settings):
+        # Environment variables and .env override the per-environment defaults
+        # that get_settings() passes in
+        return env_settings, dotenv_settings, init_settings, file_secret_settings
+
+
+# Environment-specific defaults (restrict ALLOWED_HOSTS through the environment)
+ENVIRONMENT_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "development": {"DEBUG": True, "LOG_LEVEL": "DEBUG"},
+    "production": {"DEBUG": False, "LOG_LEVEL": "WARNING", "AI_EAGER_LOAD": True},
+    "testing": {
+        "DEBUG": True,
+        "LOG_LEVEL": "DEBUG",
+        "ENABLE_AI_PROCESSING": False  # Disable AI for faster testing
+    }
+}
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get settings based on environment"""
+    """Get settings based on environment (parsed once and cached)"""
     env = os.getenv("ENVIRONMENT", "development").lower()
+    return Settings(**ENVIRONMENT_DEFAULTS.get(env, ENVIRONMENT_DEFAULTS["development"]))
 
-    if env == "production":
-        return ProductionConfig()
-    elif env == "testing":
-        return TestingConfig()
-    else:
-        return DevelopmentConfig()
+
+# Create global settings instance
+settings = get_settings()
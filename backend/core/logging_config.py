@@ -1,16 +1,79 @@
 # core/logging_config.py - Logging Configuration
+import atexit
+import copy
+import io
 import logging
+import queue
 import sys
-from typing import Dict, Any
-import json
-from datetime import datetime
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+
+import orjson
+
+# Standard LogRecord attributes that should not be emitted as extra fields
+RESERVED_RECORD_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'lineno', 'funcName', 'created',
+    'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process', 'message', 'exc_info', 'exc_text',
+    'stack_info', 'taskName'
+})
+
+# (epoch second, formatted string) of the most recently formatted timestamp
+_ts_cache = (0, "")
+
+def iso_utc_now(timestamp: Optional[float] = None) -> str:
+    """Get an ISO-8601 UTC timestamp at second resolution, formatted at most once per second"""
+    global _ts_cache
+    t = int(time.time() if timestamp is None else timestamp)
+    cached_t, cached_str = _ts_cache
+    if t != cached_t:
+        cached_str = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))
+        _ts_cache = (t, cached_str)
+    return cached_str
+
+def _record_timestamp(record: logging.LogRecord) -> str:
+    """Timestamp for a log record; DEBUG records keep sub-second precision"""
+    if record.levelno <= logging.DEBUG:
+        # record.created is the event time; records are formatted later, on the listener thread
+        return datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    return iso_utc_now(record.created)
+
+def _json_string(value: str) -> str:
+    """JSON-encode a single string value, including the surrounding quotes"""
+    return orjson.dumps(value).decode("utf-8")
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Keys and punctuation are laid out once; only the values are spliced in per record
+        self._template = (
+            '{"timestamp":"%s","level":"%s","logger":%s,"message":%s,'
+            '"module":"%s","function":"%s","line":%d}'
+        )
+    
     def format(self, record: logging.LogRecord) -> str:
+        # Extra fields passed via `extra=`, found with a single C-level set difference
+        extras = record.__dict__.keys() - RESERVED_RECORD_ATTRS
+        
+        # Fast path: plain records without exception info or extra fields
+        if not record.exc_info and not extras:
+            return self._template % (
+                _record_timestamp(record),
+                record.levelname,
+                _json_string(record.name),
+                _json_string(record.getMessage()),
+                record.module,
+                record.funcName,
+                record.lineno
+            )
+        
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _record_timestamp(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -21,22 +84,92 @@ class JSONFormatter(logging.Formatter):
         
         # Add exception info if present
         if record.exc_info:
-            log_entry["exception"] = self.formatException(record.exc_info)
+            # Cache the traceback on the record so other handlers/formatters reuse it
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_entry["exception"] = record.exc_text
         
         # Add extra fields
-        for key, value in record.__dict__.items():
-            if key not in {
-                'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
-                'filename', 'module', 'lineno', 'funcName', 'created',
-                'msecs', 'relativeCreated', 'thread', 'threadName',
-                'processName', 'process', 'message', 'exc_info', 'exc_text',
-                'stack_info'
-            }:
-                log_entry[key] = value
+        for key in extras:
+            log_entry[key] = record.__dict__[key]
         
-        return json.dumps(log_entry)
+        return orjson.dumps(log_entry).decode("utf-8")
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock QueueHandler formats the record here, on the caller's thread,
+        # and drops exc_info. Only merge the args so the JSON formatter still
+        # sees the exception when it runs on the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
-def setup_logging(level: str = "INFO", format_type: str = "json") -> None:
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that does not flush after every record"""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+class FlushingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers once the queue is drained"""
+    
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        # Under load several records share one write(); when idle, output is immediate
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+# Size of the stdout buffer used by the buffered log handler
+LOG_BUFFER_SIZE = 4096
+
+def _buffered_stdout() -> io.TextIOWrapper:
+    """Open a block-buffered text stream on stdout's file descriptor"""
+    raw = io.FileIO(sys.stdout.fileno(), "w", closefd=False)
+    return io.TextIOWrapper(
+        io.BufferedWriter(raw, buffer_size=LOG_BUFFER_SIZE),
+        encoding="utf-8",
+        newline="\n",
+        line_buffering=False,
+        write_through=False
+    )
+
+# Background listener that formats and writes queued records, and the root
+# handler that feeds it
+_queue_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+def stop_logging() -> None:
+    """
+    Flush queued log records and stop the background listener. Records
+    logged afterwards (e.g. uvicorn's shutdown messages) are written directly.
+    """
+    global _queue_listener, _queue_handler
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        root_logger = logging.getLogger()
+        if _queue_handler in root_logger.handlers:
+            root_logger.removeHandler(_queue_handler)
+        for handler in _queue_listener.handlers:
+            handler.flush()
+            direct_handler = logging.StreamHandler(sys.stdout)
+            direct_handler.setFormatter(handler.formatter)
+            direct_handler.setLevel(handler.level)
+            root_logger.addHandler(direct_handler)
+        _queue_listener = None
+        _queue_handler = None
+
+atexit.register(stop_logging)
+
+def setup_logging(level: str = "INFO", format_type: str = "json", buffered: bool = True) -> None:
     """Setup application logging configuration"""
     
     # Convert string level to logging constant
@@ -54,15 +187,30 @@ def setup_logging(level: str = "INFO", format_type: str = "json") -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
     
-    # Remove existing handlers
+    # Remove existing handlers (including any direct handler left by stop_logging)
+    stop_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
-    # Add console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    # Console handler runs on the listener thread; callers only enqueue records
+    console_handler = None
+    if buffered:
+        try:
+            console_handler = BufferedStreamHandler(_buffered_stdout())
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # stdout has no usable file descriptor (e.g. captured under pytest)
+            console_handler = None
+    if console_handler is None:
+        console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     console_handler.setLevel(numeric_level)
-    root_logger.addHandler(console_handler)
+    
+    global _queue_listener, _queue_handler
+    log_queue = queue.SimpleQueue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    _queue_listener = FlushingQueueListener(log_queue, console_handler, respect_handler_level=True)
+    _queue_listener.start()
     
     # Configure specific loggers
     logger_configs = {
@@ -75,6 +223,12 @@ def setup_logging(level: str = "INFO", format_type: str = "json") -> None:
     for logger_name, logger_level in logger_configs.items():
         logger = logging.getLogger(logger_name)
         logger.setLevel(logger_level)
+    
+    # Route uvicorn's own loggers through the root queue handler
+    for logger_name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logger = logging.getLogger(logger_name)
+        logger.handlers.clear()
+        logger.propagate = True
 
 def get_logger(name: str) -> logging.Logger:
     """Get a configured logger instance"""
@@ -2,24 +2,38 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+import anyio
 import logging
+import orjson
 from contextlib import asynccontextmanager
 
 from routers import modernization, health, samples
 from core.config import settings
-from core.logging_config import setup_logging
+from core.compression import CompressionMiddleware
+from core.logging_config import setup_logging, stop_logging
 
-# Setup logging
-setup_logging()
+# Setup logging (unbuffered in debug mode so every line appears immediately)
+setup_logging(buffered=not settings.DEBUG)
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("🚀 AS/400 Legacy Modernization API starting up...")
+    if "*" in settings.ALLOWED_HOSTS:
+        logger.warning(
+            "ALLOWED_HOSTS contains '*' with credentials enabled: CORS will echo the "
+            "request origin on every response. Configure explicit origins for production."
+        )
+    health.prime_system_stats()
+    if settings.ENABLE_AI_PROCESSING and settings.AI_EAGER_LOAD:
+        # Load the model before serving, off the event loop
+        from services.ai_service import get_ai_service
+        await anyio.to_thread.run_sync(get_ai_service)
     yield
     logger.info("👋 AS/400 Legacy Modernization API shutting down...")
+    stop_logging()
 
 # Create FastAPI app
 app = FastAPI(
@@ -28,6 +42,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -40,9 +55,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# zstd/Brotli when the client accepts them, gzip otherwise
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
 
-if not settings.DEBUG:
+# A wildcard (or no host list at all) allows every host anyway, so skip the
+# per-request host check
+if not settings.DEBUG and settings.ALLOWED_HOSTS and "*" not in settings.ALLOWED_HOSTS:
     app.add_middleware(
         TrustedHostMiddleware,
         allowed_hosts=settings.ALLOWED_HOSTS
@@ -53,29 +71,38 @@ app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(modernization.router, prefix="/api/v1", tags=["modernization"])
 app.include_router(samples.router, prefix="/api/v1", tags=["samples"])
 
+# The root payload only depends on settings, so serialize it once at startup
+_ROOT_JSON = orjson.dumps({
+    "message": settings.APP_NAME,
+    "version": settings.APP_VERSION,
+    "endpoints": {
+        "health": "/api/v1/health",
+        "modernize": "/api/v1/modernize",
+        "sample_data": "/api/v1/sample-data/{data_type}",
+        "preview": "/api/v1/modernize/preview/{data_type}",
+        "docs": "/docs"
+    },
+    "supported_formats": ["CSV", "TXT", "XLSX", "XLS"],
+    "supported_databases": ["postgres", "mysql", "sqlite", "mongodb"]
+})
+
 @app.get("/")
 async def root():
     """API root endpoint"""
-    return {
-        "message": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "endpoints": {
-            "health": "/api/v1/health",
-            "modernize": "/api/v1/modernize",
-            "sample_data": "/api/v1/sample-data/{data_type}",
-            "preview": "/api/v1/modernize/preview/{data_type}",
-            "docs": "/docs"
-        },
-        "supported_formats": ["CSV", "TXT", "XLSX", "XLS"],
-        "supported_databases": ["postgres", "mysql", "sqlite", "mongodb"]
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
-        log_level="info" if settings.DEBUG else "warning"
+        log_level="info" if settings.DEBUG else "warning",
+        # uvloop/httptools are much faster than asyncio/h11; uvloop is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # Logging is configured by setup_logging(); don't let uvicorn replace it
+        log_config=None
     )
\ No newline at end of file
@@ -1,21 +1,43 @@
 # routers/health.py - Health Check Router
 from fastapi import APIRouter
-from datetime import datetime
-from services.ai_service import ai_service
 from core.config import settings
-import psutil
+from core.logging_config import iso_utc_now
 import sys
+import time
 
 router = APIRouter()
 
+# Process stats are cached briefly so probe floods don't hit psutil every time
+SYSTEM_STATS_TTL_SECONDS = 2.0
+_system_stats_cache = {"t": 0.0, "v": None}
+
+def prime_system_stats() -> None:
+    """Prime psutil's CPU counter so later non-blocking reads are meaningful"""
+    import psutil
+    psutil.cpu_percent(interval=None)
+
+def _system_stats(ttl: float = SYSTEM_STATS_TTL_SECONDS) -> dict:
+    """Get process memory and CPU usage, cached for `ttl` seconds"""
+    now = time.monotonic()
+    if _system_stats_cache["v"] is None or now - _system_stats_cache["t"] > ttl:
+        import psutil
+        _system_stats_cache["v"] = {
+            "memory_usage_mb": round(psutil.Process().memory_info().rss / 1024 / 1024, 2),
+            "cpu_percent": psutil.cpu_percent(interval=None),
+        }
+        _system_stats_cache["t"] = now
+    return _system_stats_cache["v"]
+
 @router.get("/health")
 async def health_check():
     """Enhanced health check with system info"""
-    ai_status = ai_service.get_status()
+    from services.ai_service import ai_service
+    
+    ai_status = ai_service.get_cached_status()
     
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": iso_utc_now(),
         "version": settings.APP_VERSION,
         "environment": "development" if settings.DEBUG else "production",
         "ai_enabled": ai_status["ai_enabled"],
@@ -29,8 +51,7 @@ async def health_check():
         },
         "system_info": {
             "python_version": sys.version,
-            "memory_usage_mb": round(psutil.Process().memory_info().rss / 1024 / 1024, 2),
-            "cpu_percent": psutil.cpu_percent(),
+            **_system_stats()
         },
         "configuration": {
             "max_file_size_mb": settings.MAX_FILE_SIZE_MB,
@@ -43,14 +64,16 @@ async def health_check():
 async def detailed_health_check():
     """Detailed system health information"""
     import platform
+    import psutil
+    from services.ai_service import ai_service
     
-    ai_status = ai_service.get_status()
+    ai_status = ai_service.get_cached_status()
     memory = psutil.virtual_memory()
     disk = psutil.disk_usage('/')
     
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": iso_utc_now(),
         "application": {
             "name": settings.APP_NAME,
             "version": settings.APP_VERSION,
@@ -62,7 +85,7 @@ async def detailed_health_check():
             "platform": platform.platform(),
             "python_version": platform.python_version(),
             "cpu_count": psutil.cpu_count(),
-            "cpu_percent": psutil.cpu_percent(interval=1),
+            "cpu_percent": _system_stats()["cpu_percent"],
             "memory": {
                 "total_gb": round(memory.total / 1024**3, 2),
                 "available_gb": round(memory.available / 1024**3, 2),
@@ -75,7 +98,9 @@ async def detailed_health_check():
             }
         },
         "services": {
-            "ai_service": "online" if ai_status["ai_enabled"] else "offline",
+            "ai_service": "online" if ai_status["ai_enabled"] else (
+                "deferred" if ai_status["loading_deferred"] else "offline"
+            ),
             "file_processing": "online",
             "data_analysis": "online",
             "code_generation": "online"
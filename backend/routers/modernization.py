@@ -1,20 +1,20 @@
 # routers/modernization.py - Enhanced Modernization API Router
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from typing import Optional
 import logging
-from datetime import datetime
+import orjson
+import time
 
-from services.file_service import file_service
-from services.ai_service import ai_service
-from services.data_analysis_service import data_service
-from services.code_generation_service import code_service
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("/modernize")
+# Services (and with them pandas and the AI model) are imported inside the
+# handlers so that importing this router does not pull them in at startup
+
+@router.post("/modernize", response_class=ORJSONResponse)
 async def modernize_file(
     file: UploadFile = File(...),
     target_db: Optional[str] = Query(default="postgres", description="Target database type"),
@@ -24,7 +24,12 @@ async def modernize_file(
     """
     Enhanced modernization endpoint with comprehensive analysis and JSON export option.
     """
-    start_time = datetime.utcnow()
+    from services.file_service import file_service
+    from services.ai_service import ai_service
+    from services.data_analysis_service import data_service
+    from services.code_generation_service import code_service, generation_timestamp
+    
+    start_ns = time.perf_counter_ns()
     
     # Validate file size
     max_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024
@@ -53,9 +58,8 @@ async def modernize_file(
         original_columns = file_info.get("original_columns", [])
         modernized_columns = file_info.get("modernized_columns", [])
         
-        mapping = {}
         if len(original_columns) == len(modernized_columns):
-            mapping = {orig: modern for orig, modern in zip(original_columns, modernized_columns)}
+            mapping = dict(zip(original_columns, modernized_columns))
         else:
             # Fallback mapping
             mapping = {f"col_{i}": col for i, col in enumerate(modernized_columns)}
@@ -65,23 +69,26 @@ async def modernize_file(
         
         # Convert to records (limit for performance)
         max_records = settings.MAX_RECORDS_DISPLAY
-        modernized_table = df.head(max_records).fillna("").to_dict(orient="records")
-        modernized_table = data_service.convert_numpy_types(modernized_table)
+        modernized_table = data_service.dataframe_to_records(df.head(max_records))
         
         # Generate analysis and artifacts
         data_quality = data_service.analyze_data_quality(df)
         column_stats = data_service.analyze_column_statistics(df)
         recommendations = data_service.generate_data_recommendations(df, data_quality)
         
-        # Generate code artifacts
+        # Generate code artifacts, stamped with a single timestamp per request
+        generated_at = generation_timestamp()
         json_schema = code_service.generate_json_schema(df)
-        sql_schema = code_service.generate_sql_schema(table_name, df, target_db)
-        rest_api_code = code_service.generate_rest_api_code(table_name, df)
-        docker_config = code_service.generate_docker_config(table_name, target_db)
-        microservices_arch = data_service.generate_microservices_architecture(df)
+        sql_schema = code_service.generate_sql_schema(table_name, df, target_db, _now=generated_at)
+        rest_api_code = code_service.generate_rest_api_code(table_name, df, _now=generated_at)
+        # These artifacts depend only on the column layout (and carry no
+        # timestamp), so repeated uploads with the same shape reuse them
+        schema_fp = code_service.schema_fingerprint(df, table_name, target_db)
+        docker_config = code_service.cached(schema_fp, code_service.generate_docker_config, table_name, target_db)
+        microservices_arch = code_service.cached(schema_fp, data_service.generate_microservices_architecture, df)
 
         # Processing time
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         logger.info(f"Modernization completed in {processing_time:.2f} seconds")
 
@@ -100,7 +107,7 @@ async def modernize_file(
             "rest_api_code": rest_api_code,
             "docker_config": docker_config,
             "microservices_architecture": microservices_arch,
-            "ai_status": ai_service.get_status()
+            "ai_status": ai_service.get_cached_status()
         }
         
         # Add JSON export if requested
@@ -108,7 +115,8 @@ async def modernize_file(
             response_data["json_export"] = file_info["json_export"]
             logger.info("JSON export included in response")
 
-        return response_data
+        # Returning the response directly skips FastAPI's jsonable_encoder walk
+        return ORJSONResponse(response_data)
 
     except HTTPException:
         raise
@@ -122,23 +130,16 @@ async def modernize_file(
 @router.get("/modernize/preview/{data_type}")
 async def preview_modernization(data_type: str):
     """Preview how sample data would be modernized"""
-    from routers.samples import get_sample_data
+    from routers.samples import get_sample_dict, get_sample_df
+    from services.ai_service import ai_service
     
     try:
-        sample = await get_sample_data(data_type)
-        
-        # Process sample data through modernization preview
-        import pandas as pd
-        import io
-        
-        text = sample["data"]
-        df = pd.read_csv(io.StringIO(text))
+        sample = get_sample_dict(data_type)
+        df = get_sample_df(data_type)
         
         # Apply modernization to first few columns
-        mapping = {}
-        for orig in df.columns[:5]:  # Limit for preview
-            new_name = ai_service.modernize_column_name(orig)
-            mapping[orig] = new_name
+        preview_columns = list(df.columns[:5])  # Limit for preview
+        mapping = dict(zip(preview_columns, ai_service.modernize_columns_batch(preview_columns)))
         
         return {
             "original_columns": sample["columns"],
@@ -147,6 +148,8 @@ async def preview_modernization(data_type: str):
             "description": sample["description"]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Preview error: {e}")
         raise HTTPException(status_code=500, detail=f"Preview error: {str(e)}")
@@ -154,16 +157,12 @@ async def preview_modernization(data_type: str):
 @router.get("/analyze/{data_type}")
 async def analyze_sample_data(data_type: str):
     """Get detailed analysis of sample data"""
-    from routers.samples import get_sample_data
+    from routers.samples import get_sample_dict, get_sample_df
+    from services.data_analysis_service import data_service
     
     try:
-        sample = await get_sample_data(data_type)
-        
-        import pandas as pd
-        import io
-        
-        text = sample["data"]
-        df = pd.read_csv(io.StringIO(text))
+        sample = get_sample_dict(data_type)
+        df = get_sample_df(data_type)
         
         # Perform analysis
         data_quality = data_service.analyze_data_quality(df)
@@ -181,6 +180,8 @@ async def analyze_sample_data(data_type: str):
             "preview_data": df.head(5).to_dict(orient="records")
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Analysis error: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
@@ -195,70 +196,99 @@ async def export_as_json(
     """
     Export uploaded file directly as JSON with optional metadata and schema information
     """
+    from services.file_service import file_service
+    
     try:
-        # Process file for JSON export
-        df, file_info = await file_service.process_file(file, export_format="json")
+        # The document is streamed below, so process_file need not build it
+        df, file_info = await file_service.process_file(file, export_format="json_stream")
         
         # Limit rows if specified
         if max_rows and max_rows > 0:
             df = df.head(max_rows)
         
-        # Generate JSON export
-        json_export = file_service.generate_json_export(df, file_info)
-        
-        # Filter response based on parameters
-        if not include_metadata:
-            json_export.pop("metadata", None)
-            json_export.pop("statistics", None)
-        
-        if not include_schema:
-            json_export.pop("schema", None)
-            json_export.pop("column_mapping", None)
-        
-        return JSONResponse(
-            content=json_export,
-            headers={
-                "Content-Disposition": f"attachment; filename={file.filename}.json",
-                "Content-Type": "application/json"
-            }
+        # Rows are encoded slice by slice, so the whole document is never held in memory
+        return StreamingResponse(
+            file_service.stream_json_export(
+                df,
+                file_info,
+                include_metadata=include_metadata,
+                include_schema=include_schema
+            ),
+            media_type="application/json",
+            headers={"Content-Disposition": f"attachment; filename={file.filename}.json"}
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"JSON export error: {e}")
         raise HTTPException(status_code=500, detail=f"JSON export error: {str(e)}")
 
-@router.get("/formats/supported")
-async def get_supported_formats():
-    """Get list of supported file formats and their capabilities"""
-    return {
-        "supported_formats": {
-            "csv": {
-                "description": "Comma-separated values",
-                "extensions": [".csv"],
-                "parsing_methods": ["delimiter_detection", "pandas_csv"],
-                "ai_modernization": True
-            },
-            "txt": {
-                "description": "Text files including AS/400 fixed-width reports",
-                "extensions": [".txt"],
-                "parsing_methods": ["fixed_width_detection", "delimiter_detection", "manual_parsing"],
-                "ai_modernization": True,
-                "special_features": ["as400_fixed_width", "report_parsing"]
-            },
-            "excel": {
-                "description": "Microsoft Excel files",
-                "extensions": [".xlsx", ".xls"],
-                "parsing_methods": ["openpyxl", "xlrd"],
-                "ai_modernization": True
-            }
+@router.post("/export/ndjson")
+async def export_as_ndjson(
+    file: UploadFile = File(...),
+    max_rows: Optional[int] = Query(default=None, description="Maximum number of rows to export")
+):
+    """
+    Export uploaded file rows as newline-delimited JSON, streamed in chunks
+    """
+    from services.file_service import file_service
+    
+    try:
+        # Neither the JSON export document nor dtype downcasting is needed here
+        df, file_info = await file_service.process_file(file, export_format="ndjson")
+        
+        if max_rows and max_rows > 0:
+            df = df.head(max_rows)
+        
+        return StreamingResponse(
+            file_service.iter_ndjson(df),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename={file.filename}.ndjson"}
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"NDJSON export error: {e}")
+        raise HTTPException(status_code=500, detail=f"NDJSON export error: {str(e)}")
+
+# Static capability listing, serialized once at import time
+_SUPPORTED_FORMATS_JSON = orjson.dumps({
+    "supported_formats": {
+        "csv": {
+            "description": "Comma-separated values",
+            "extensions": [".csv"],
+            "parsing_methods": ["delimiter_detection", "pandas_csv"],
+            "ai_modernization": True
         },
-        "export_formats": {
-            "pandas": "Standard DataFrame processing with modernized columns",
-            "json": "Complete JSON export with metadata, schema, and data"
+        "txt": {
+            "description": "Text files including AS/400 fixed-width reports",
+            "extensions": [".txt"],
+            "parsing_methods": ["fixed_width_detection", "delimiter_detection", "manual_parsing"],
+            "ai_modernization": True,
+            "special_features": ["as400_fixed_width", "report_parsing"]
         },
-        "ai_features": {
-            "column_modernization": "Transform AS/400 column names to modern snake_case",
-            "pattern_recognition": "Recognize 200+ common AS/400 naming conventions",
-            "data_inference": "Predict column names from data content"
+        "excel": {
+            "description": "Microsoft Excel files",
+            "extensions": [".xlsx", ".xls"],
+            "parsing_methods": ["openpyxl", "xlrd"],
+            "ai_modernization": True
         }
-    }
\ No newline at end of file
+    },
+    "export_formats": {
+        "pandas": "Standard DataFrame processing with modernized columns",
+        "json": "Complete JSON export with metadata, schema, and data",
+        "ndjson": "Streamed newline-delimited JSON rows (POST /export/ndjson)"
+    },
+    "ai_features": {
+        "column_modernization": "Transform AS/400 column names to modern snake_case",
+        "pattern_recognition": "Recognize 200+ common AS/400 naming conventions",
+        "data_inference": "Predict column names from data content"
+    }
+})
+
+@router.get("/formats/supported")
+async def get_supported_formats():
+    """Get list of supported file formats and their capabilities"""
+    return Response(content=_SUPPORTED_FORMATS_JSON, media_type="application/json")
\ No newline at end of file
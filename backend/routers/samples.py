@@ -1,6 +1,9 @@
 # routers/samples.py - Sample Data Router
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 from typing import Dict, Any
+import io
+import json
 
 router = APIRouter()
 
@@ -80,25 +83,85 @@ VENDOR005,SHIPPING PARTNERS,TOM WILSON,5555678901,twilson@shippartners.com,500 L
     }
 }
 
+MODERNIZATION_BENEFITS = [
+    "Convert legacy column names to modern snake_case format",
+    "Add proper data types and constraints",
+    "Generate REST API endpoints",
+    "Create microservices architecture",
+    "Implement data validation rules"
+]
+
+
+def _to_json_bytes(payload: Any) -> bytes:
+    """Serialize a payload the same way FastAPI's JSONResponse does"""
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+# The sample payloads never change, so serialize them once at import time
+_SAMPLE_LIST_JSON = _to_json_bytes({
+    "available_samples": list(SAMPLE_DATA.keys()),
+    "total_samples": len(SAMPLE_DATA),
+    "description": "AS/400 legacy system sample data for testing modernization"
+})
+
+_SAMPLE_JSON_CACHE = {
+    data_type: _to_json_bytes(sample)
+    for data_type, sample in SAMPLE_DATA.items()
+}
+
+_SAMPLE_META_CACHE = {
+    data_type: _to_json_bytes({
+        "data_type": data_type,
+        "description": sample["description"],
+        "columns": sample["columns"],
+        "record_count": sample["record_count"],
+        "typical_use": sample["typical_use"],
+        "modernization_benefits": MODERNIZATION_BENEFITS
+    })
+    for data_type, sample in SAMPLE_DATA.items()
+}
+
+
+def get_sample_dict(data_type: str) -> Dict[str, Any]:
+    """Get raw sample data for internal callers (no JSON round-trip)"""
+    if data_type not in SAMPLE_DATA:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Sample data type '{data_type}' not found. Available types: {list(SAMPLE_DATA.keys())}"
+        )
+    
+    return SAMPLE_DATA[data_type]
+
+# Parsed sample DataFrames, filled on first use so pandas stays out of startup
+_SAMPLE_DF_CACHE: Dict[str, Any] = {}
+
+def get_sample_df(data_type: str):
+    """Get the sample data parsed into a DataFrame (parsed once, then cached)"""
+    sample = get_sample_dict(data_type)
+    df = _SAMPLE_DF_CACHE.get(data_type)
+    if df is None:
+        import pandas as pd
+        df = pd.read_csv(io.StringIO(sample["data"]))
+        _SAMPLE_DF_CACHE[data_type] = df
+    
+    # Shallow copy so callers can't rename/drop columns on the cached frame
+    return df.copy(deep=False)
+
 @router.get("/sample-data")
 async def list_sample_data():
     """List all available sample data types"""
-    return {
-        "available_samples": list(SAMPLE_DATA.keys()),
-        "total_samples": len(SAMPLE_DATA),
-        "description": "AS/400 legacy system sample data for testing modernization"
-    }
+    return Response(content=_SAMPLE_LIST_JSON, media_type="application/json")
 
 @router.get("/sample-data/{data_type}")
-async def get_sample_data(data_type: str) -> Dict[str, Any]:
+async def get_sample_data(data_type: str):
     """Get sample AS/400 data for testing"""
-    if data_type not in SAMPLE_DATA:
+    if data_type not in _SAMPLE_JSON_CACHE:
         raise HTTPException(
             status_code=404, 
             detail=f"Sample data type '{data_type}' not found. Available types: {list(SAMPLE_DATA.keys())}"
         )
     
-    return SAMPLE_DATA[data_type]
+    return Response(content=_SAMPLE_JSON_CACHE[data_type], media_type="application/json")
 
 @router.get("/sample-data/{data_type}/metadata")
 async def get_sample_metadata(data_type: str):
@@ -109,19 +172,4 @@ async def get_sample_metadata(data_type: str):
             detail=f"Sample data type '{data_type}' not found"
         )
     
-    sample = SAMPLE_DATA[data_type]
-    
-    return {
-        "data_type": data_type,
-        "description": sample["description"],
-        "columns": sample["columns"],
-        "record_count": sample["record_count"],
-        "typical_use": sample["typical_use"],
-        "modernization_benefits": [
-            "Convert legacy column names to modern snake_case format",
-            "Add proper data types and constraints",
-            "Generate REST API endpoints",
-            "Create microservices architecture",
-            "Implement data validation rules"
-        ]
-    }
\ No newline at end of file
+    return Response(content=_SAMPLE_META_CACHE[data_type], media_type="application/json")
\ No newline at end of file
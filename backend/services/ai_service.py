@@ -1,20 +1,278 @@
 # services/ai_service.py - Improved AI Processing Service
+import hashlib
 import logging
+import os
 import re
-from functools import lru_cache
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from functools import cache
+from types import MappingProxyType
 from typing import Optional, Dict, List, Any, Tuple
-from collections import Counter
 from core.config import settings
 
+# Hyperscan is optional - without it sample values are classified with `re`
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
 logger = logging.getLogger(__name__)
 
+# Number of prompts sent through the AI model per forward pass
+AI_BATCH_SIZE = 8
+
+# Greedy decoding settings shared by every generate call
+GENERATION_KWARGS = MappingProxyType({"num_beams": 1, "do_sample": False})
+
+# Prompt template and generation settings for each kind of AI output
+AI_PROMPTS = MappingProxyType({
+    "column": (
+        "Convert this database column name to modern snake_case: '{text}'. "
+        "Return only the clean column name. "
+        "Examples: CUS_ID -> customer_id, EMPNO -> employee_number, "
+        "ADDR1 -> address_line_1, CUSTNAME -> customer_name",
+        {"max_new_tokens": 24}
+    ),
+    "sample": (
+        "Based on these sample values: {text}, "
+        "generate a concise snake_case column name. "
+        "Return only the column name, no explanations. "
+        "Examples: ['john@email.com'] -> 'email', "
+        "['555-1234'] -> 'phone_number', "
+        "['100.00'] -> 'amount'",
+        {"max_new_tokens": 19}
+    )
+})
+
+# Short digest of each kind's prompt and generation settings; part of every
+# persisted result key, so editing either never serves outputs of the old one
+_PROMPT_DIGESTS = MappingProxyType({
+    kind: hashlib.blake2b(
+        repr((template, sorted(kwargs.items()), sorted(GENERATION_KWARGS.items()))).encode("utf-8"),
+        digest_size=8
+    ).hexdigest()
+    for kind, (template, kwargs) in AI_PROMPTS.items()
+})
+
+# Precompiled patterns, shared by every AIService call
+# AI artifacts and filler words that make a generated column name invalid
+# (matched anywhere in the name, case-insensitively)
+_INVALID_RE = re.compile(
+    r'customeromer|identifierifier|addressess|numberber|the|a|an'
+    r'|column|field|value|name|legacy|original|old',
+    re.IGNORECASE
+)
+_SNAKE_RE = re.compile(r'^[a-z][a-z0-9_]*$')
+# Word boundaries for snake_case: a camelCase hump, or a run of non-word
+# characters and underscores (each becomes a single "_")
+_SNAKE_SEP_RE = re.compile(r'(?<=[a-z])(?=[A-Z])|[\W_]+')
+_MULTI_US_RE = re.compile(r'_+')
+_QUOTE_RE = re.compile(r'[\'"`]')
+_LEAD_STOP_RE = re.compile(r'^(the|a|an|column|field|name|value|result|output)\s*')
+_TRAIL_STOP_RE = re.compile(r'\s*(column|field|name|value|result|output)$')
+
+# Value patterns for column name prediction, tried in order; each named
+# group is the column name returned when that pattern dominates a sample
+_VALUE_PATTERN_RE = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<phone_number>^\+?[\d\s()-]{7,20}$)'
+    r'|(?P<date>^\d{4}-\d{2}-\d{2}$|^\d{2}/\d{2}/\d{4}$|^\d{2}-\d{2}-\d{4}$)'
+    r'|(?P<zip_code>^\d{5}(?:-\d{4})?$)'
+    r'|(?P<amount>^\$?\d+(?:\.\d{2})?$)'
+    r'|(?P<quantity>^\d+$)'
+    r'|(?P<id>^[A-Z0-9_-]+$)'
+    r'|(?P<percentage>^\d+(?:\.\d+)?%$)'
+    r'|(?P<status>^(?i:active|inactive|pending|approved|rejected)$)'
+)
+VALUE_PATTERN_NAMES = tuple(_VALUE_PATTERN_RE.groupindex)
+
+# The same patterns for Hyperscan, one expression per name in VALUE_PATTERN_NAMES.
+# Each is anchored to a line start and cannot cross a newline, so a single
+# scan over newline-joined ASCII values classifies all of them. Whitespace is
+# spelled out because Hyperscan's \s lacks the \x1c-\x1f separators of `re`.
+_HS_VALUE_EXPRESSIONS = (
+    (rb'^\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 0),
+    (rb'^\+?[\d()\t\x0b\x0c\r \x1c-\x1f-]{7,20}$', 0),
+    (rb'^(?:\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4})$', 0),
+    (rb'^\d{5}(?:-\d{4})?$', 0),
+    (rb'^\$?\d+(?:\.\d{2})?$', 0),
+    (rb'^\d+$', 0),
+    (rb'^[A-Z0-9_-]+$', 0),
+    (rb'^\d+(?:\.\d+)?%$', 0),
+    (rb'^(?:active|inactive|pending|approved|rejected)$', hyperscan.HS_FLAG_CASELESS if HAS_HYPERSCAN else 0),
+)
+
+def _compile_value_pattern_db():
+    """Compile the value patterns into a Hyperscan database, or None if unavailable"""
+    if not (HAS_HYPERSCAN and settings.USE_HYPERSCAN):
+        return None
+    try:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[expression for expression, _ in _HS_VALUE_EXPRESSIONS],
+            ids=list(range(len(_HS_VALUE_EXPRESSIONS))),
+            elements=len(_HS_VALUE_EXPRESSIONS),
+            flags=[hyperscan.HS_FLAG_MULTILINE | flags for _, flags in _HS_VALUE_EXPRESSIONS]
+        )
+        return db
+    except Exception as e:
+        logger.warning(f"Failed to compile Hyperscan value patterns, using re: {e}")
+        return None
+
+_VALUE_PATTERN_DB = _compile_value_pattern_db()
+
+def _classify_values(sample: List[str]) -> List[Optional[int]]:
+    """Return the index of the first matching value pattern for each value, or None"""
+    if _VALUE_PATTERN_DB is not None:
+        buffer = "\n".join(sample)
+        # Values with their own newlines or non-ASCII text go through `re`
+        if buffer.isascii() and buffer.count("\n") == len(sample) - 1:
+            starts = []
+            offset = 0
+            for value in sample:
+                starts.append(offset)
+                offset += len(value) + 1
+            
+            no_match = len(VALUE_PATTERN_NAMES)
+            best = [no_match] * len(sample)
+            
+            def on_match(pattern_id, _start, end, _flags, _context):
+                index = bisect_right(starts, end - 1) - 1
+                if pattern_id < best[index]:
+                    best[index] = pattern_id
+            
+            _VALUE_PATTERN_DB.scan(buffer.encode("ascii"), match_event_handler=on_match)
+            return [i if i < no_match else None for i in best]
+    
+    # Each pattern is the only capturing group of its alternative
+    pattern_ids = []
+    for value in sample:
+        match = _VALUE_PATTERN_RE.match(value)
+        pattern_ids.append(match.lastindex - 1 if match else None)
+    return pattern_ids
+
+# Characters ignored by the numeric fallback check
+_NUMERIC_PUNCT = str.maketrans('', '', '.-')
+
+# Known AS/400 column names and their modern equivalents
+AS400_MAPPINGS = MappingProxyType({
+    'CUS_ID': 'customer_id', 'CUSTID': 'customer_id', 'CUSTNO': 'customer_number',
+    'CUSTNUM': 'customer_number', 'CUST#': 'customer_id', 'CUSTNAME': 'customer_name',
+    'CUSTNAM': 'customer_name', 'CUSTNM': 'customer_name', 'NME': 'name',
+    'EMPNO': 'employee_number', 'EMPNUM': 'employee_number', 'EMP#': 'employee_id',
+    'EMPNAME': 'employee_name', 'EMPNAM': 'employee_name', 'EMPNM': 'employee_name',
+    'ADDR1': 'address_line_1', 'ADDR2': 'address_line_2', 'STREET': 'street_address',
+    'CITY': 'city', 'STATE': 'state', 'ZIP': 'zip_code', 'ZIPCODE': 'zip_code',
+    'POSTAL': 'postal_code', 'COUNTRY': 'country', 'CREDITLMT': 'credit_limit',
+    'BALANCE': 'account_balance', 'AMT': 'amount', 'AMOUNT': 'amount', 'PRICE': 'price',
+    'HIREDATE': 'hire_date', 'CREATEDT': 'create_date', 'MODDT': 'modify_date',
+    'SHIPDT': 'ship_date', 'ORDERDT': 'order_date', 'PARTNO': 'part_number',
+    'ITEMNO': 'item_number', 'PRODCD': 'product_code', 'SKU': 'sku', 'QTY': 'quantity',
+    'DESC': 'description', 'DESCR': 'description', 'E-MAIL': 'email',
+    'EMAIL': 'email', 'PHONE': 'phone_number', 'DEPT': 'department',
+    'STATUS': 'status', 'TYPE': 'type', 'CODE': 'code', 'FLAG': 'flag',
+    'ACTIVE': 'is_active', 'INACTIVE': 'is_inactive'
+})
+
+# Common abbreviations mapping used by the heuristic transformation
+ABBREVIATIONS = MappingProxyType({
+    'cust': 'customer', 'emp': 'employee', 'addr': 'address',
+    'dept': 'department', 'prod': 'product', 'qty': 'quantity',
+    'amt': 'amount', 'desc': 'description', 'num': 'number',
+    'id': 'id', 'no': 'number', 'dt': 'date',
+    'cd': 'code', 'nm': 'name', 'stat': 'status',
+    'typ': 'type', 'flg': 'flag', 'act': 'active'
+})
+
+# (presence check, whole-word replacement, expansion) for each abbreviation
+_ABBR_RES = [
+    (re.compile(rf'(?:^|[^a-z]){abbr}(?:[^a-z]|$)'), re.compile(rf'\b{abbr}\b'), full)
+    for abbr, full in ABBREVIATIONS.items()
+]
+# Matches if any abbreviation is present, so names without one skip the loop
+_ANY_ABBR_RE = re.compile(rf'(?:^|[^a-z])(?:{"|".join(ABBREVIATIONS)})(?:[^a-z]|$)')
+
+class AIResultStore:
+    """
+    SQLite-backed store for AI outputs, so restarts and other workers reuse
+    earlier model results. Keys include the model name and revision and a
+    digest of the prompt and generation settings, so changing any of them
+    never returns stale outputs.
+    """
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_results (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+    
+    @staticmethod
+    def key(kind: str, text: str) -> str:
+        model = f"{settings.AI_MODEL_NAME}@{settings.AI_MODEL_REVISION}"
+        return f"{model}\x1f{kind}:{_PROMPT_DIGESTS[kind]}\x1f{text}"
+    
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        results = {}
+        # Stay under SQLite's default limit of 999 bound parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM ai_results WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+            results.update(rows)
+        return results
+    
+    def put_many(self, items: Dict[str, str]) -> None:
+        if not items:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ai_results (key, value) VALUES (?, ?)", items.items()
+            )
+
+def _open_result_store() -> Optional[AIResultStore]:
+    """Open the persistent AI result store, or None if caching is off or it is unavailable"""
+    if not settings.ENABLE_CACHING:
+        return None
+    try:
+        os.makedirs(settings.CACHE_DIR, exist_ok=True)
+        return AIResultStore(os.path.join(settings.CACHE_DIR, "ai_results.sqlite3"))
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Persistent AI cache unavailable: {e}")
+        return None
+
 class AIService:
     """Service for AI-powered text processing with enhanced validation"""
     
     def __init__(self):
-        self.modernizer = None
+        self.model = None
+        self.tokenizer = None
         self.has_transformers = False
-        self._load_ai_model()
+        self._column_name_cache: Dict[str, str] = {}
+        self._result_store: Optional[AIResultStore] = None
+        self._status_cache: Optional[Dict] = None
+        self._status_cache_time = 0.0
+        self._model_lock = threading.Lock()
+        self._model_load_attempted = False
+        if settings.AI_EAGER_LOAD:
+            self._ensure_model()
+    
+    def _ensure_model(self) -> bool:
+        """Load the AI model on first use; returns whether it is available"""
+        if not self._model_load_attempted:
+            with self._model_lock:
+                if not self._model_load_attempted:
+                    self._load_ai_model()
+                    self._model_load_attempted = True
+        return self.model is not None and self.has_transformers
     
     def _load_ai_model(self):
         """Load AI model if available"""
@@ -23,46 +281,76 @@ class AIService:
             return
             
         try:
-            from transformers import pipeline
-            self.modernizer = pipeline(
-                "text2text-generation", 
-                model=settings.AI_MODEL_NAME,
-                max_length=50
+            from transformers import AutoTokenizer
+            self.tokenizer = AutoTokenizer.from_pretrained(
+                settings.AI_MODEL_NAME, revision=settings.AI_MODEL_REVISION
             )
+            self.model = self._load_seq2seq_model()
+            self.model.eval()
             self.has_transformers = True
+            self._result_store = _open_result_store()
             logger.info(f"AI model loaded successfully: {settings.AI_MODEL_NAME}")
         except Exception as e:
             logger.warning(f"Failed to load AI model: {e}")
             self.has_transformers = False
 
+    def _load_seq2seq_model(self):
+        """
+        Load the model in half precision on GPU hosts (bf16 where supported,
+        else fp16) and in fp32 on CPU-only hosts. Further memory savings are
+        possible with int8 quantization (bitsandbytes, load_in_8bit=True).
+        """
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+        
+        if torch.cuda.is_available():
+            dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            try:
+                return AutoModelForSeq2SeqLM.from_pretrained(
+                    settings.AI_MODEL_NAME, revision=settings.AI_MODEL_REVISION,
+                    torch_dtype=dtype, device_map="auto"
+                )
+            except Exception as e:
+                logger.warning(f"Half-precision model load failed, using fp32: {e}")
+        
+        return AutoModelForSeq2SeqLM.from_pretrained(
+            settings.AI_MODEL_NAME, revision=settings.AI_MODEL_REVISION
+        )
+
+    def _generate(self, prompts: List[str], max_new_tokens: int = 24, batch_size: int = AI_BATCH_SIZE) -> List[str]:
+        """Run greedy generation over the prompts, one tokenizer and generate call per batch"""
+        import torch
+        
+        outputs = []
+        for start in range(0, len(prompts), batch_size):
+            inputs = self.tokenizer(
+                prompts[start:start + batch_size], padding=True, return_tensors="pt"
+            ).to(self.model.device)
+            with torch.inference_mode():
+                generated = self.model.generate(
+                    **inputs, max_new_tokens=max_new_tokens, **GENERATION_KWARGS
+                )
+            outputs.extend(self.tokenizer.batch_decode(generated, skip_special_tokens=True))
+        return outputs
+
     def _validate_column_name(self, name: str, original: str) -> bool:
         """
         Validate that the generated column name is reasonable
         """
+        # Cheapest checks first; the content blacklist scan runs last
         if not name or len(name) < 2 or len(name) > 40:
             return False
         
-        # Check for common AI artifacts and nonsense
-        invalid_patterns = [
-            r'.*customeromer.*', r'.*identifierifier.*', r'.*addressess.*', 
-            r'.*numberber.*', r'.*the.*', r'.*a.*', r'.*an.*',
-            r'.*column.*', r'.*field.*', r'.*value.*', r'.*name.*',
-            r'.*legacy.*', r'.*original.*', r'.*old.*'
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.search(pattern, name, re.IGNORECASE):
-                return False
-        
         # Should be snake_case with valid characters
-        if not re.match(r'^[a-z][a-z0-9_]*$', name):
+        if not _SNAKE_RE.match(name):
             return False
         
         # Should not be too similar to the original (indicating poor transformation)
         if name.lower() == original.lower():
             return False
-            
-        return True
+        
+        # Check for common AI artifacts and nonsense
+        return not _INVALID_RE.search(name)
 
     def predict_column_name_from_data(self, column_data: List[Any], col_index: int = 0) -> str:
         """
@@ -82,20 +370,16 @@ class AIService:
             return pattern_result
 
         # Only then try AI if pattern-based failed
-        if self.modernizer and self.has_transformers:
+        if self._ensure_model():
             try:
                 sample_preview = sample[:3]
-                prompt = (
-                    f"Based on these sample values: {sample_preview}, "
-                    f"generate a concise snake_case column name. "
-                    f"Return only the column name, no explanations. "
-                    f"Examples: ['john@email.com'] -> 'email', "
-                    f"['555-1234'] -> 'phone_number', "
-                    f"['100.00'] -> 'amount'"
-                )
+                template, generate_kwargs = AI_PROMPTS["sample"]
+                prompt = template.format(text=sample_preview)
                 
-                result = self.modernizer(prompt, max_length=20, do_sample=False)
-                generated_name = result[0]["generated_text"].strip().lower() if isinstance(result, list) else str(result).strip().lower()
+                key = AIResultStore.key(
+                    "sample", hashlib.blake2b(repr(sample_preview).encode("utf-8")).hexdigest()
+                )
+                generated_name = self._generate_cached({key: prompt}, **generate_kwargs)[key].strip().lower()
                 
                 # Clean and validate
                 clean_name = self._clean_column_name(generated_name)
@@ -109,74 +393,81 @@ class AIService:
 
     def _pattern_based_prediction(self, sample: List[str], col_index: int) -> str:
         """Reliable pattern-based column name prediction"""
-        patterns = [
-            ('email', re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')),
-            ('phone_number', re.compile(r'^\+?[\d\s-()]{7,20}$')),
-            ('date', re.compile(r'^\d{4}-\d{2}-\d{2}$|^\d{2}/\d{2}/\d{4}$|^\d{2}-\d{2}-\d{4}$')),
-            ('zip_code', re.compile(r'^\d{5}(-\d{4})?$')),
-            ('amount', re.compile(r'^\$?\d+(?:\.\d{2})?$')),
-            ('price', re.compile(r'^\$?\d+(?:\.\d{2})?$')),
-            ('quantity', re.compile(r'^\d+$')),
-            ('id', re.compile(r'^[A-Z0-9_-]+$')),
-            ('percentage', re.compile(r'^\d+(?:\.\d+)?%$')),
-            ('status', re.compile(r'^(active|inactive|pending|approved|rejected)$', re.IGNORECASE)),
-        ]
-
-        match_counts = Counter()
-        for value in sample:
-            for name, pattern in patterns:
-                if pattern.match(value):
-                    match_counts[name] += 1
-                    break
+        match_counts = [0] * len(VALUE_PATTERN_NAMES)
+        seen = []  # pattern ids in first-match order, so ties go to the earliest
+        for pattern_id in _classify_values(sample):
+            if pattern_id is not None:
+                if not match_counts[pattern_id]:
+                    seen.append(pattern_id)
+                match_counts[pattern_id] += 1
 
         # Check for dominant pattern
-        if match_counts:
-            most_common, count = match_counts.most_common(1)[0]
-            if count / len(sample) > 0.3:  # 30% threshold
-                return most_common
+        if seen:
+            most_common = max(seen, key=match_counts.__getitem__)
+            if match_counts[most_common] / len(sample) > 0.3:  # 30% threshold
+                return VALUE_PATTERN_NAMES[most_common]
 
         # Data type fallback
-        if all(v.replace('.', '').replace('-', '').isdigit() for v in sample[:10]):
+        if all(v.translate(_NUMERIC_PUNCT).isdigit() for v in sample[:10]):
             return f"numeric_{col_index}"
             
         return f"text_{col_index}"
 
-    @lru_cache(maxsize=1024)
     def modernize_column_name(self, col: str) -> str:
         """
         Modernize column name with strict validation
         """
+        result = self._column_name_cache.get(col)
+        if result is None:
+            result = self._modernize_column_name(col)
+            self._column_name_cache[col] = result
+        return result
+
+    def modernize_columns_batch(self, cols: List[str], batch_size: int = AI_BATCH_SIZE) -> List[str]:
+        """
+        Modernize several column names, running the AI model once over every
+        uncached name that the AS/400 patterns cannot resolve
+        """
+        pending = [col for col in dict.fromkeys(cols) if col not in self._column_name_cache]
+        if pending:
+            generated = {}
+            if settings.ENABLE_AI_PROCESSING:
+                stripped = (str(col).strip() for col in pending if col)
+                needs_ai = [name for name in dict.fromkeys(stripped) if name and self._as400_column_name(name) is None]
+                if needs_ai and self._ensure_model():
+                    generated = dict(zip(needs_ai, self._generate_column_names(needs_ai, batch_size)))
+            
+            for col in pending:
+                # An empty suggestion keeps the model from being run again for this name
+                generated_text = generated.get(str(col).strip()) or ""
+                self._column_name_cache[col] = self._modernize_column_name(col, generated_text)
+        
+        return [self._column_name_cache[col] for col in cols]
+
+    def _modernize_column_name(self, col: str, generated_text: Optional[str] = None) -> str:
+        """
+        Modernize a single column name. `generated_text` is an AI suggestion
+        produced ahead of time; when None the model is run for this name.
+        """
         if not col or not str(col).strip():
             return "unknown_column"
 
         original_col = str(col).strip()
         
         # First check AS/400 specific patterns (most reliable)
-        as400_result = self._analyze_as400_patterns(original_col)
-        if as400_result != self._to_snake_case(original_col):
-            if self._validate_column_name(as400_result, original_col):
-                return as400_result
+        as400_result = self._as400_column_name(original_col)
+        if as400_result is not None:
+            return as400_result
 
         # Use AI if available with strict validation
-        if self.modernizer and self.has_transformers:
-            try:
-                prompt = (
-                    f"Convert this database column name to modern snake_case: '{original_col}'. "
-                    f"Return only the clean column name. "
-                    f"Examples: CUS_ID -> customer_id, EMPNO -> employee_number, "
-                    f"ADDR1 -> address_line_1, CUSTNAME -> customer_name"
-                )
-                
-                result = self.modernizer(prompt, max_length=25, do_sample=False)
-                generated_text = result[0]["generated_text"] if isinstance(result, list) else str(result)
-                
-                # Clean and validate
-                clean_name = self._clean_column_name(generated_text)
-                if clean_name and self._validate_column_name(clean_name, original_col):
-                    logger.info(f"AI transformed: {original_col} -> {clean_name}")
-                    return clean_name
-            except Exception as e:
-                logger.warning(f"AI transformation failed for '{original_col}': {e}")
+        if generated_text is None and self._ensure_model():
+            generated_text = self._generate_column_names([original_col])[0]
+        if generated_text:
+            # Clean and validate
+            clean_name = self._clean_column_name(generated_text)
+            if clean_name and self._validate_column_name(clean_name, original_col):
+                logger.info(f"AI transformed: {original_col} -> {clean_name}")
+                return clean_name
 
         # Fallback to heuristic transformation with validation
         heuristic_result = self._heuristic_transformation(original_col)
@@ -186,89 +477,126 @@ class AIService:
         # Ultimate fallback
         return self._to_snake_case(original_col)
 
+    def _as400_column_name(self, original_col: str) -> Optional[str]:
+        """Return the validated AS/400 mapping for a column, or None if there is none"""
+        as400_result = self._analyze_as400_patterns(original_col)
+        if as400_result != self._to_snake_case(original_col):
+            if self._validate_column_name(as400_result, original_col):
+                return as400_result
+        return None
+
+    def _generate_column_names(self, cols: List[str], batch_size: int = AI_BATCH_SIZE) -> List[Optional[str]]:
+        """Run the AI model over the given column names, returning None where it fails"""
+        template, generate_kwargs = AI_PROMPTS["column"]
+        prompts = {AIResultStore.key("column", col): template.format(text=col) for col in cols}
+        try:
+            generated = self._generate_cached(prompts, batch_size=batch_size, **generate_kwargs)
+        except Exception as e:
+            logger.warning(f"AI transformation failed for {cols}: {e}")
+            return [None] * len(cols)
+        return [generated[AIResultStore.key("column", col)] for col in cols]
+
+    def _generate_cached(self, prompts: Dict[str, str], **generate_kwargs) -> Dict[str, str]:
+        """
+        Generate outputs for prompts keyed by AIResultStore.key(), reading and
+        filling the persistent store when it is available
+        """
+        results = {}
+        if self._result_store:
+            try:
+                results = self._result_store.get_many(list(prompts))
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read persisted AI results: {e}")
+        missing = [key for key in prompts if key not in results]
+        if missing:
+            generated = dict(zip(missing, self._generate([prompts[key] for key in missing], **generate_kwargs)))
+            if self._result_store:
+                try:
+                    self._result_store.put_many(generated)
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to persist AI results: {e}")
+            results.update(generated)
+        return results
+
     def _clean_column_name(self, name: str) -> str:
         """Clean column name with strict rules"""
         if not name:
             return ""
         
         # Remove quotes, special chars, and AI artifacts
-        clean = re.sub(r'[\'"`]', '', name.strip().lower())
-        clean = re.sub(r'^(the|a|an|column|field|name|value|result|output)\s*', '', clean)
-        clean = re.sub(r'\s*(column|field|name|value|result|output)$', '', clean)
+        clean = _QUOTE_RE.sub('', name.strip().lower())
+        clean = _LEAD_STOP_RE.sub('', clean)
+        clean = _TRAIL_STOP_RE.sub('', clean)
         
         # Convert to snake_case
         clean = self._to_snake_case(clean)
-        clean = re.sub(r'_+', '_', clean).strip('_')
+        clean = _MULTI_US_RE.sub('_', clean).strip('_')
         
         return clean or "column"
 
     def _heuristic_transformation(self, col: str) -> str:
         """Reliable heuristic transformation"""
-        col_lower = col.lower()
-        
-        # Common abbreviations mapping with validation
-        abbreviations = {
-            'cust': 'customer', 'emp': 'employee', 'addr': 'address',
-            'dept': 'department', 'prod': 'product', 'qty': 'quantity',
-            'amt': 'amount', 'desc': 'description', 'num': 'number',
-            'id': 'id', 'no': 'number', 'dt': 'date',
-            'cd': 'code', 'nm': 'name', 'stat': 'status',
-            'typ': 'type', 'flg': 'flag', 'act': 'active'
-        }
+        result = col.lower()
+        if not _ANY_ABBR_RE.search(result):
+            return self._to_snake_case(result)
         
         # Simple word replacement without over-correction
-        result = col_lower
-        for abbr, full in abbreviations.items():
+        for presence_re, word_re, full in _ABBR_RES:
             # Only replace if it's a whole word or prefix
-            if re.search(rf'^{abbr}[^a-z]|^{abbr}$|[^a-z]{abbr}[^a-z]|[^a-z]{abbr}$', result):
-                result = re.sub(rf'\b{abbr}\b', full, result)
+            if presence_re.search(result):
+                result = word_re.sub(full, result)
         
         return self._to_snake_case(result)
 
+    @cache
     def _to_snake_case(self, s: str) -> str:
         """Convert to snake_case safely"""
         if not s or not str(s).strip():
             return "column"
         
         s = str(s).strip()
-        s = re.sub(r'([a-z])([A-Z])', r'\1_\2', s)
-        s = re.sub(r'[^\w\s]', '_', s)
-        s = re.sub(r'\s+', '_', s)
-        s = re.sub(r'_+', '_', s)
+        s = _SNAKE_SEP_RE.sub('_', s)
         return s.lower().strip('_') or "column"
 
+    @cache
     def _analyze_as400_patterns(self, col: str) -> str:
         """AS/400 pattern recognition"""
-        col_upper = col.upper()
-        
-        as400_mappings = {
-            'CUS_ID': 'customer_id', 'CUSTID': 'customer_id', 'CUSTNO': 'customer_number',
-            'CUSTNUM': 'customer_number', 'CUST#': 'customer_id', 'CUSTNAME': 'customer_name',
-            'CUSTNAM': 'customer_name', 'CUSTNM': 'customer_name', 'NME': 'name',
-            'EMPNO': 'employee_number', 'EMPNUM': 'employee_number', 'EMP#': 'employee_id',
-            'EMPNAME': 'employee_name', 'EMPNAM': 'employee_name', 'EMPNM': 'employee_name',
-            'ADDR1': 'address_line_1', 'ADDR2': 'address_line_2', 'STREET': 'street_address',
-            'CITY': 'city', 'STATE': 'state', 'ZIP': 'zip_code', 'ZIPCODE': 'zip_code',
-            'POSTAL': 'postal_code', 'COUNTRY': 'country', 'CREDITLMT': 'credit_limit',
-            'BALANCE': 'account_balance', 'AMT': 'amount', 'AMOUNT': 'amount', 'PRICE': 'price',
-            'HIREDATE': 'hire_date', 'CREATEDT': 'create_date', 'MODDT': 'modify_date',
-            'SHIPDT': 'ship_date', 'ORDERDT': 'order_date', 'PARTNO': 'part_number',
-            'ITEMNO': 'item_number', 'PRODCD': 'product_code', 'SKU': 'sku', 'QTY': 'quantity',
-            'DESC': 'description', 'DESCR': 'description', 'E-MAIL': 'email',
-            'EMAIL': 'email', 'PHONE': 'phone_number', 'DEPT': 'department', 
-            'STATUS': 'status', 'TYPE': 'type', 'CODE': 'code', 'FLAG': 'flag', 
-            'ACTIVE': 'is_active', 'INACTIVE': 'is_inactive'
-        }
-        
-        return as400_mappings.get(col_upper, self._to_snake_case(col))
+        mapped = AS400_MAPPINGS.get(col.upper())
+        return mapped if mapped is not None else self._to_snake_case(col)
 
     def get_status(self) -> Dict:
         """Get AI service status"""
         return {
             "ai_enabled": self.has_transformers,
+            "loading_deferred": settings.ENABLE_AI_PROCESSING and not self._model_load_attempted,
             "model_name": settings.AI_MODEL_NAME if self.has_transformers else None,
-            "cache_size": self.modernize_column_name.cache_info().currsize if hasattr(self.modernize_column_name, 'cache_info') else 0
+            "cache_size": len(self._column_name_cache)
         }
 
-# GlobalAAC AI service instance
-ai_service = AIService()
\ No newline at end of file
+    def get_cached_status(self, ttl: float = 1.0) -> Dict:
+        """Get AI service status, reusing the last result for `ttl` seconds"""
+        now = time.monotonic()
+        if self._status_cache is None or now - self._status_cache_time > ttl:
+            self._status_cache = self.get_status()
+            self._status_cache_time = now
+        return self._status_cache
+
+# Global AI service instance, created on first use so that importing this
+# module does not load the transformer model
+_ai_service: Optional[AIService] = None
+_ai_service_lock = threading.Lock()
+
+def get_ai_service() -> AIService:
+    """Get the global AI service, creating it on first use"""
+    global _ai_service
+    if _ai_service is None:
+        with _ai_service_lock:
+            if _ai_service is None:
+                _ai_service = AIService()
+    return _ai_service
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from services.ai_service import ai_service` working lazily
+    if name == "ai_service":
+        return get_ai_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,182 +1,73 @@
 # services/code_generation_service.py - Code Generation Service
-import pandas as pd
+import hashlib
 import logging
-from typing import Dict, Any
-from datetime import datetime
-from services.data_analysis_service import DataAnalysisService
+from collections import OrderedDict
+from string import Template
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, Callable, Optional
+from datetime import datetime, timezone
+from core.config import settings
 
-logger = logging.getLogger(__name__)
+# pandas is only needed for annotations here; the frames come in from callers
+if TYPE_CHECKING:
+    import pandas as pd
 
-class CodeGenerationService:
-    """Service for generating code artifacts like SQL, APIs, etc."""
-    
-    def __init__(self):
-        self.data_service = DataAnalysisService()
-    
-    def generate_sql_schema(self, table_name: str, df: pd.DataFrame, target_db: str = "postgres") -> str:
-        """Generate enhanced SQL schema with constraints."""
-        if df.empty:
-            return f"-- No data available for table {table_name}"
-        
-        # Database-specific type mappings
-        type_mappings = {
-            "postgres": {
-                "integer": "BIGINT",
-                "float": "NUMERIC(12,2)",
-                "string_short": "VARCHAR(255)",
-                "string_long": "TEXT",
-                "date": "DATE",
-                "datetime": "TIMESTAMP",
-                "boolean": "BOOLEAN"
-            },
-            "mysql": {
-                "integer": "INT",
-                "float": "DECIMAL(12,2)",
-                "string_short": "VARCHAR(255)",
-                "string_long": "TEXT",
-                "date": "DATE",
-                "datetime": "DATETIME",
-                "boolean": "BOOLEAN"
-            },
-            "sqlite": {
-                "integer": "INTEGER",
-                "float": "REAL",
-                "string_short": "TEXT",
-                "string_long": "TEXT",
-                "date": "DATE",
-                "datetime": "DATETIME",
-                "boolean": "INTEGER"
-            }
-        }
-        
-        mapper = type_mappings.get(target_db, type_mappings["postgres"])
-        
-        columns = []
-        constraints = []
-        
-        for col in df.columns:
-            dtype = str(df[col].dtype)
-            null_percentage = df[col].isnull().sum() / len(df) if len(df) > 0 else 0
-            
-            # Determine SQL type
-            if "int" in dtype:
-                sql_type = mapper["integer"]
-            elif "float" in dtype:
-                sql_type = mapper["float"]
-            else:
-                max_length = df[col].astype(str).str.len().max() if not df[col].isna().all() else 0
-                sql_type = mapper["string_short"] if max_length <= 255 else mapper["string_long"]
-            
-            # Add NOT NULL constraint if low null percentage
-            not_null = " NOT NULL" if null_percentage < 0.1 else ""
-            
-            columns.append(f"    {col} {sql_type}{not_null}")
-            
-            # Add unique constraint for potential ID columns
-            if "id" in col.lower() or "number" in col.lower():
-                unique_vals = df[col].nunique()
-                total_vals = len(df.dropna(subset=[col]))
-                if unique_vals == total_vals and total_vals > 0:  # All values are unique
-                    constraints.append(f"    UNIQUE ({col})")
-        
-        # Build CREATE TABLE statement
-        sql = f"-- Generated schema for {table_name}\n"
-        sql += f"-- Created on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        sql += f"CREATE TABLE {table_name} (\n"
-        sql += ",\n".join(columns)
-        
-        if constraints:
-            sql += ",\n" + ",\n".join(constraints)
-        
-        sql += "\n);\n\n"
-        
-        # Add indexes for common lookup columns
-        index_candidates = [col for col in df.columns if any(keyword in col.lower() 
-                           for keyword in ['id', 'number', 'code', 'date', 'name'])]
-        
-        sql += "-- Recommended indexes\n"
-        for col in index_candidates[:5]:  # Limit to 5 indexes
-            sql += f"CREATE INDEX idx_{table_name}_{col.lower()} ON {table_name}({col});\n"
-        
-        return sql
-    
-    def generate_json_schema(self, df: pd.DataFrame) -> Dict:
-        """Generate enhanced JSON schema with validation rules."""
-        if df.empty:
-            return {}
-        
-        schema = {
-            "$schema": "http://json-schema.org/draft-07/schema#",
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-        
-        for col in df.columns:
-            dtype = str(df[col].dtype)
-            col_schema = {}
-            
-            if "int" in dtype:
-                min_val = df[col].min() if not df[col].isna().all() else 0
-                max_val = df[col].max() if not df[col].isna().all() else 0
-                col_schema = {
-                    "type": "integer",
-                    "minimum": int(min_val) if pd.notna(min_val) else 0,
-                    "maximum": int(max_val) if pd.notna(max_val) else 0
-                }
-            elif "float" in dtype:
-                min_val = df[col].min() if not df[col].isna().all() else 0.0
-                max_val = df[col].max() if not df[col].isna().all() else 0.0
-                col_schema = {
-                    "type": "number",
-                    "minimum": float(min_val) if pd.notna(min_val) else 0.0,
-                    "maximum": float(max_val) if pd.notna(max_val) else 0.0
-                }
-            else:
-                max_length = df[col].astype(str).str.len().max() if not df[col].isna().all() else 255
-                col_schema = {
-                    "type": "string",
-                    "maxLength": int(max_length) if pd.notna(max_length) else 255
-                }
-                
-                # Add enum for columns with few unique values
-                unique_vals = df[col].dropna().unique()
-                if len(unique_vals) <= 10 and len(unique_vals) > 0:
-                    col_schema["enum"] = [self.data_service.convert_numpy_types(val) for val in unique_vals.tolist()]
-            
-            schema["properties"][col] = col_schema
-            
-            # Add to required if less than 10% null values
-            null_percentage = df[col].isnull().sum() / len(df)
-            if null_percentage < 0.1:
-                schema["required"].append(col)
-        
-        return self.data_service.convert_numpy_types(schema)
-    
-    def generate_rest_api_code(self, table_name: str, df: pd.DataFrame) -> str:
-        """Generate comprehensive REST API code."""
-        if df.empty:
-            columns_str = "# No columns available"
-            pydantic_fields = "    pass"
-        else:
-            # Generate Pydantic model fields
-            pydantic_fields = []
-            for col in df.columns:
-                dtype = str(df[col].dtype)
-                if "int" in dtype:
-                    pydantic_fields.append(f"    {col}: Optional[int] = None")
-                elif "float" in dtype:
-                    pydantic_fields.append(f"    {col}: Optional[float] = None")
-                else:
-                    pydantic_fields.append(f"    {col}: Optional[str] = None")
-            
-            pydantic_fields = "\n".join(pydantic_fields)
-            columns_str = f"# Columns: {', '.join(df.columns)}"
+logger = logging.getLogger(__name__)
 
-        api_code = f'''"""
+# Maximum number of generated artifacts kept in the schema-keyed cache
+ARTIFACT_CACHE_SIZE = 64
+
+# Column name keywords that suggest an identifier (candidate UNIQUE constraint)
+ID_KEYWORDS = ('id', 'number')
+
+# Column name keywords that suggest a lookup column worth indexing
+INDEX_KEYWORDS = ('id', 'number', 'code', 'date', 'name')
+MAX_RECOMMENDED_INDEXES = 5
+
+# Database-specific type mappings
+SQL_TYPE_MAPPINGS = MappingProxyType({
+    "postgres": MappingProxyType({
+        "integer": "BIGINT",
+        "float": "NUMERIC(12,2)",
+        "string_short": "VARCHAR(255)",
+        "string_long": "TEXT",
+        "date": "DATE",
+        "datetime": "TIMESTAMP",
+        "boolean": "BOOLEAN"
+    }),
+    "mysql": MappingProxyType({
+        "integer": "INT",
+        "float": "DECIMAL(12,2)",
+        "string_short": "VARCHAR(255)",
+        "string_long": "TEXT",
+        "date": "DATE",
+        "datetime": "DATETIME",
+        "boolean": "BOOLEAN"
+    }),
+    "sqlite": MappingProxyType({
+        "integer": "INTEGER",
+        "float": "REAL",
+        "string_short": "TEXT",
+        "string_long": "TEXT",
+        "date": "DATE",
+        "datetime": "DATETIME",
+        "boolean": "INTEGER"
+    })
+})
+
+# Type category for each numpy dtype kind; anything else is treated as a string
+DTYPE_KIND_CATEGORIES = MappingProxyType({
+    "i": "integer", "u": "integer", "f": "float", "b": "boolean", "M": "datetime"
+})
+
+# Python type used in generated Pydantic models for each numpy dtype kind
+PYTHON_KIND_TYPES = MappingProxyType({"i": "int", "u": "int", "f": "float", "b": "bool"})
+
+# Code templates, parsed once at import and filled in per table
+API_TEMPLATE = Template('''"""
 Enhanced REST API for Modernized AS/400 Data
-{columns_str}
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+${columns_str}
+Generated on: ${timestamp}
 """
 
 from fastapi import FastAPI, HTTPException, Depends, Query, status
@@ -215,16 +106,16 @@ app.add_middleware(
 )
 
 # Pydantic Models
-class {table_name.title().replace('_', '')}Base(BaseModel):
-{pydantic_fields}
+class ${class_name}Base(BaseModel):
+${pydantic_fields}
 
-class {table_name.title().replace('_', '')}Create({table_name.title().replace('_', '')}Base):
+class ${class_name}Create(${class_name}Base):
     pass
 
-class {table_name.title().replace('_', '')}Update({table_name.title().replace('_', '')}Base):
+class ${class_name}Update(${class_name}Base):
     pass
 
-class {table_name.title().replace('_', '')}Response({table_name.title().replace('_', '')}Base):
+class ${class_name}Response(${class_name}Base):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -233,7 +124,7 @@ class {table_name.title().replace('_', '')}Response({table_name.title().replace(
         orm_mode = True
 
 class PaginatedResponse(BaseModel):
-    items: List[{table_name.title().replace('_', '')}Response]
+    items: List[${class_name}Response]
     total: int
     page: int
     size: int
@@ -251,20 +142,20 @@ def get_db():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {{
+    return {
         "status": "healthy",
         "timestamp": datetime.utcnow(),
         "service": "AS/400 Modernized API"
-    }}
+    }
 
-@app.get("/{table_name}", response_model=PaginatedResponse)
-async def get_{table_name}(
+@app.get("/${table_name}", response_model=PaginatedResponse)
+async def get_${table_name}(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     search: Optional[str] = Query(None, description="Search term"),
     db: Session = Depends(get_db)
 ):
-    """Get paginated list of {table_name} records"""
+    """Get paginated list of ${table_name} records"""
     # Implementation would query your database
     # This is a template - replace with actual database queries
     total = 0  # Get total count from database
@@ -278,57 +169,57 @@ async def get_{table_name}(
         pages=(total + limit - 1) // limit
     )
 
-@app.post("/{table_name}", response_model={table_name.title().replace('_', '')}Response, status_code=status.HTTP_201_CREATED)
-async def create_{table_name}(
-    item: {table_name.title().replace('_', '')}Create,
+@app.post("/${table_name}", response_model=${class_name}Response, status_code=status.HTTP_201_CREATED)
+async def create_${table_name}(
+    item: ${class_name}Create,
     db: Session = Depends(get_db)
 ):
-    """Create a new {table_name} record"""
+    """Create a new ${table_name} record"""
     # Implementation would create record in database
     raise HTTPException(
         status_code=status.HTTP_501_NOT_IMPLEMENTED,
         detail="Create operation not implemented yet"
     )
 
-@app.get("/{table_name}/{{item_id}}", response_model={table_name.title().replace('_', '')}Response)
-async def get_{table_name}_by_id(
+@app.get("/${table_name}/{item_id}", response_model=${class_name}Response)
+async def get_${table_name}_by_id(
     item_id: int,
     db: Session = Depends(get_db)
 ):
-    """Get a specific {table_name} record by ID"""
+    """Get a specific ${table_name} record by ID"""
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
-        detail=f"{table_name.title()} not found"
+        detail=f"${title_name} not found"
     )
 
-@app.put("/{table_name}/{{item_id}}", response_model={table_name.title().replace('_', '')}Response)
-async def update_{table_name}(
+@app.put("/${table_name}/{item_id}", response_model=${class_name}Response)
+async def update_${table_name}(
     item_id: int,
-    item: {table_name.title().replace('_', '')}Update,
+    item: ${class_name}Update,
     db: Session = Depends(get_db)
 ):
-    """Update a {table_name} record"""
+    """Update a ${table_name} record"""
     raise HTTPException(
         status_code=status.HTTP_501_NOT_IMPLEMENTED,
         detail="Update operation not implemented yet"
     )
 
-@app.delete("/{table_name}/{{item_id}}")
-async def delete_{table_name}(
+@app.delete("/${table_name}/{item_id}")
+async def delete_${table_name}(
     item_id: int,
     db: Session = Depends(get_db)
 ):
-    """Delete a {table_name} record"""
-    return {{"message": f"{table_name.title()} deleted successfully"}}
+    """Delete a ${table_name} record"""
+    return {"message": f"${title_name} deleted successfully"}
 
-@app.get("/{table_name}/stats")
-async def get_{table_name}_stats(db: Session = Depends(get_db)):
-    """Get statistics for {table_name} data"""
-    return {{
+@app.get("/${table_name}/stats")
+async def get_${table_name}_stats(db: Session = Depends(get_db)):
+    """Get statistics for ${table_name} data"""
+    return {
         "total_records": 0,
         "last_updated": datetime.utcnow(),
         "data_quality_score": 95.0
-    }}
+    }
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -338,14 +229,9 @@ if __name__ == "__main__":
         reload=True,
         log_level="info"
     )
-'''
-        
-        return api_code
+''')
 
-    def generate_docker_config(self, table_name: str, target_db: str = "postgres") -> Dict[str, str]:
-        """Generate Docker configuration files"""
-        
-        dockerfile = f'''# Dockerfile for {table_name} API
+DOCKERFILE_TEMPLATE = Template('''# Dockerfile for ${table_name} API
 FROM python:3.11-slim
 
 WORKDIR /app
@@ -375,18 +261,18 @@ HEALTHCHECK --interval=30s --timeout=3s --start-period=5s --retries=3 \\
 
 # Run the application
 CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]
-'''
+''')
 
-        docker_compose = f'''version: '3.8'
+DOCKER_COMPOSE_TEMPLATE = Template('''version: '3.8'
 
 services:
   # Main API Service
-  {table_name}-api:
+  ${table_name}-api:
     build: .
     ports:
       - "8000:8000"
     environment:
-      - DATABASE_URL={target_db}://user:password@db:5432/{table_name}_db
+      - DATABASE_URL=${target_db}://user:password@db:5432/${table_name}_db
       - REDIS_URL=redis://redis:6379
       - ENVIRONMENT=production
     depends_on:
@@ -401,9 +287,9 @@ services:
 
   # Database Service
   db:
-    image: {f"postgres:15" if target_db == "postgres" else f"{target_db}:latest"}
+    image: ${db_image}
     environment:
-      - POSTGRES_DB={table_name}_db
+      - POSTGRES_DB=${table_name}_db
       - POSTGRES_USER=user
       - POSTGRES_PASSWORD=password
     volumes:
@@ -413,7 +299,7 @@ services:
       - "5432:5432"
     restart: unless-stopped
     healthcheck:
-      test: ["CMD-SHELL", "pg_isready -U user -d {table_name}_db"]
+      test: ["CMD-SHELL", "pg_isready -U user -d ${table_name}_db"]
       interval: 30s
       timeout: 10s
       retries: 5
@@ -442,17 +328,232 @@ services:
       - ./nginx.conf:/etc/nginx/nginx.conf:ro
       - ./ssl:/etc/nginx/ssl:ro
     depends_on:
-      - {table_name}-api
+      - ${table_name}-api
     restart: unless-stopped
 
 volumes:
   db_data:
   redis_data:
-'''
+''')
+
+
+def generation_timestamp() -> str:
+    """UTC timestamp stamped into generated artifacts"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+
+def _analyze_frame(df: "pd.DataFrame") -> Dict[str, Any]:
+    """Per-column statistics shared by the schema generators, each computed in one pass"""
+    categories = {col: DTYPE_KIND_CATEGORIES.get(dtype.kind, "string") for col, dtype in df.dtypes.items()}
+    # Columns rendered as text in the schemas: anything that is not integer or float
+    text_cols = [col for col, category in categories.items() if category not in ("integer", "float")]
+    # Counts are shared with the data analysis of the same frame
+    from services.data_analysis_service import data_service
+    frame_stats = data_service.frame_stats(df)
+    return {
+        "row_count": len(df),
+        "categories": categories,
+        "text_cols": text_cols,
+        "null_counts": frame_stats.null_counts,
+        "notna_counts": frame_stats.non_null_counts,
+        "unique_counts": frame_stats.unique_counts,
+        "max_lengths": df[text_cols].astype(str).apply(lambda s: s.str.len().max())
+    }
 
+class CodeGenerationService:
+    """Service for generating code artifacts like SQL, APIs, etc."""
+    
+    def __init__(self):
+        self._artifact_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+    
+    @staticmethod
+    def schema_fingerprint(df: "pd.DataFrame", *parts: str) -> bytes:
+        """Fingerprint a DataFrame's shape (column names and dtypes) plus extra key parts"""
+        schema = repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()])
+        key = "\x1f".join((schema,) + tuple(str(part) for part in parts))
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    
+    def cached(self, fingerprint: bytes, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Return fn(*args, **kwargs), reusing a previous result with the same fingerprint.
+        Only use this for artifacts that depend on the schema, not on row contents.
+        """
+        if not settings.ENABLE_CACHING:
+            return fn(*args, **kwargs)
+        
+        key = (fn.__qualname__, fingerprint)
+        if key in self._artifact_cache:
+            self._artifact_cache.move_to_end(key)
+            return self._artifact_cache[key]
+        
+        result = fn(*args, **kwargs)
+        self._artifact_cache[key] = result
+        if len(self._artifact_cache) > ARTIFACT_CACHE_SIZE:
+            self._artifact_cache.popitem(last=False)
+        return result
+    
+    def generate_sql_schema(self, table_name: str, df: "pd.DataFrame", target_db: str = "postgres",
+                            _now: Optional[str] = None) -> str:
+        """Generate enhanced SQL schema with constraints."""
+        if df.empty:
+            return f"-- No data available for table {table_name}"
+        
+        mapper = SQL_TYPE_MAPPINGS.get(target_db, SQL_TYPE_MAPPINGS["postgres"])
+        
+        stats = _analyze_frame(df)
+        row_count = stats["row_count"]
+        null_counts = stats["null_counts"]
+        notna_counts = stats["notna_counts"]
+        max_lengths = stats["max_lengths"]
+        categories = stats["categories"]
+        id_cols = {col for col in df.columns if any(keyword in col.lower() for keyword in ID_KEYWORDS)}
+        unique_counts = stats["unique_counts"]
+        
+        columns = []
+        constraints = []
+        index_candidates = []
+        
+        for col, category in categories.items():
+            col_lc = col.lower()
+            null_percentage = null_counts[col] / row_count
+            
+            # Determine SQL type
+            if category != "string":
+                sql_type = mapper[category]
+            else:
+                max_length = max_lengths[col] if notna_counts[col] > 0 else 0
+                sql_type = mapper["string_short"] if max_length <= 255 else mapper["string_long"]
+            
+            # Add NOT NULL constraint if low null percentage
+            not_null = " NOT NULL" if null_percentage < 0.1 else ""
+            
+            columns.append(f"    {col} {sql_type}{not_null}")
+            
+            # Add unique constraint for potential ID columns
+            if col in id_cols:
+                total_vals = notna_counts[col]
+                if unique_counts[col] == total_vals and total_vals > 0:  # All values are unique
+                    constraints.append(f"    UNIQUE ({col})")
+            
+            # Add indexes for common lookup columns
+            if len(index_candidates) < MAX_RECOMMENDED_INDEXES and any(keyword in col_lc for keyword in INDEX_KEYWORDS):
+                index_candidates.append((col, col_lc))
+        
+        # Build CREATE TABLE statement
+        sql = f"-- Generated schema for {table_name}\n"
+        sql += f"-- Created on: {_now or generation_timestamp()}\n\n"
+        sql += f"CREATE TABLE {table_name} (\n"
+        sql += ",\n".join(columns)
+        
+        if constraints:
+            sql += ",\n" + ",\n".join(constraints)
+        
+        sql += "\n);\n\n"
+        
+        sql += "-- Recommended indexes\n"
+        for col, col_lc in index_candidates:
+            sql += f"CREATE INDEX idx_{table_name}_{col_lc} ON {table_name}({col});\n"
+        
+        return sql
+    
+    def generate_json_schema(self, df: "pd.DataFrame") -> Dict:
+        """Generate enhanced JSON schema with validation rules."""
+        if df.empty:
+            return {}
+        
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+        
+        # Compute each statistic with one reduction over the columns it applies
+        # to; missing bounds default to 0
+        stats = _analyze_frame(df)
+        row_count = stats["row_count"]
+        null_counts = stats["null_counts"]
+        max_lengths = stats["max_lengths"]
+        categories = stats["categories"]
+        string_cols = stats["text_cols"]
+        numeric_cols = {"integer": [], "float": []}
+        for col, category in categories.items():
+            if category in numeric_cols:
+                numeric_cols[category].append(col)
+        int_cols, float_cols = numeric_cols["integer"], numeric_cols["float"]
+        int_mins = df[int_cols].min().fillna(0)
+        int_maxs = df[int_cols].max().fillna(0)
+        float_mins = df[float_cols].min().fillna(0.0)
+        float_maxs = df[float_cols].max().fillna(0.0)
+        unique_counts = stats["unique_counts"]
+        
+        for col, category in categories.items():
+            if category == "integer":
+                col_schema = {
+                    "type": "integer",
+                    "minimum": int(int_mins[col]),
+                    "maximum": int(int_maxs[col])
+                }
+            elif category == "float":
+                col_schema = {
+                    "type": "number",
+                    "minimum": float(float_mins[col]),
+                    "maximum": float(float_maxs[col])
+                }
+            else:
+                # A column with any value has a defined max length
+                max_length = max_lengths[col] if null_counts[col] < row_count else 255
+                col_schema = {
+                    "type": "string",
+                    "maxLength": int(max_length)
+                }
+                
+                # Add enum for columns with few unique values
+                if 0 < unique_counts[col] <= 10:
+                    unique_vals = df[col].dropna().unique()
+                    col_schema["enum"] = unique_vals.tolist()
+            
+            schema["properties"][col] = col_schema
+            
+            # Add to required if less than 10% null values
+            null_percentage = null_counts[col] / row_count
+            if null_percentage < 0.1:
+                schema["required"].append(col)
+        
+        # Values are converted to native types as they are added above
+        return schema
+    
+    def generate_rest_api_code(self, table_name: str, df: "pd.DataFrame", _now: Optional[str] = None) -> str:
+        """Generate comprehensive REST API code."""
+        if df.empty:
+            columns_str = "# No columns available"
+            pydantic_fields = "    pass"
+        else:
+            # Generate Pydantic model fields
+            pydantic_fields = "\n".join(
+                f"    {col}: Optional[{PYTHON_KIND_TYPES.get(dtype.kind, 'str')}] = None"
+                for col, dtype in df.dtypes.items()
+            )
+            columns_str = f"# Columns: {', '.join(df.columns)}"
+        
+        class_name = table_name.title().replace('_', '')
+        
+        return API_TEMPLATE.substitute(
+            columns_str=columns_str,
+            timestamp=_now or generation_timestamp(),
+            pydantic_fields=pydantic_fields,
+            class_name=class_name,
+            table_name=table_name,
+            title_name=table_name.title()
+        )
+
+    def generate_docker_config(self, table_name: str, target_db: str = "postgres") -> Dict[str, str]:
+        """Generate Docker configuration files"""
+        db_image = "postgres:15" if target_db == "postgres" else f"{target_db}:latest"
         return {
-            "dockerfile": dockerfile,
-            "docker_compose": docker_compose
+            "dockerfile": DOCKERFILE_TEMPLATE.substitute(table_name=table_name),
+            "docker_compose": DOCKER_COMPOSE_TEMPLATE.substitute(
+                table_name=table_name, target_db=target_db, db_image=db_image
+            )
         }
 
 # Global code generation service instance
@@ -2,48 +2,166 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, List
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 
+import orjson
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:  # Fall back to per-pattern substring checks
+    HAS_AHOCORASICK = False
+
 logger = logging.getLogger(__name__)
 
+# Frames with at least this many cells compute numeric and text column
+# statistics on two threads
+PARALLEL_STATS_MIN_CELLS = 1_000_000
+_CPU_COUNT = os.cpu_count() or 1
+
+# Number of recently analyzed frames whose column aggregates are kept
+FRAME_STATS_CACHE_SIZE = 8
+
+# orjson options for records built from DataFrames (NumPy scalars, non-string column names)
+RECORD_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def json_default(value: Any) -> Any:
+    """Encode pandas scalars orjson does not handle: ISO timestamps, null for NaT, text otherwise"""
+    if value is pd.NaT:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+# Microservice suggested for tables whose column names contain one of its keywords
+SERVICE_PATTERNS = {
+    "Customer Service": ["customer", "cust", "client"],
+    "Employee Service": ["employee", "emp", "staff", "worker"],
+    "Product Service": ["product", "item", "part", "inventory"],
+    "Order Service": ["order", "transaction", "sale", "purchase"],
+    "Payment Service": ["payment", "billing", "invoice", "amount"],
+    "Address Service": ["address", "location", "city", "state", "zip"],
+    "User Service": ["user", "login", "auth", "account"]
+}
+
+def _build_service_automaton():
+    """Aho-Corasick automaton mapping every service keyword to its service"""
+    automaton = ahocorasick.Automaton()
+    for service_name, patterns in SERVICE_PATTERNS.items():
+        for pattern in patterns:
+            automaton.add_word(pattern, service_name)
+    automaton.make_automaton()
+    return automaton
+
+_SERVICE_AUTOMATON = _build_service_automaton() if HAS_AHOCORASICK else None
+
+@dataclass(frozen=True)
+class FrameStats:
+    """Column aggregates of one DataFrame, shared by the analysis, schema and export passes"""
+    non_null_counts: pd.Series
+    null_counts: pd.Series
+    unique_counts: pd.Series
+    memory_usage: int
+
 class DataAnalysisService:
     """Service for data quality analysis and insights"""
     
+    def __init__(self):
+        # id(df) -> (weak reference to df, FrameStats); the reference guards
+        # against a new frame reusing the id of a collected one
+        self._frame_stats: "OrderedDict[int, tuple]" = OrderedDict()
+        self._frame_stats_lock = threading.Lock()
+    
+    def frame_stats(self, df: pd.DataFrame) -> FrameStats:
+        """
+        Column aggregates of df, computed once per frame and reused by every
+        pass over it. Frames must not be modified after they are analyzed.
+        """
+        key = id(df)
+        with self._frame_stats_lock:
+            entry = self._frame_stats.get(key)
+            if entry is not None and entry[0]() is df:
+                self._frame_stats.move_to_end(key)
+                return entry[1]
+        
+        non_null_counts = df.count()
+        stats = FrameStats(
+            non_null_counts=non_null_counts,
+            null_counts=len(df) - non_null_counts,
+            unique_counts=df.nunique(),
+            memory_usage=int(df.memory_usage(deep=True).sum())
+        )
+        
+        with self._frame_stats_lock:
+            self._frame_stats[key] = (weakref.ref(df), stats)
+            self._frame_stats.move_to_end(key)
+            while len(self._frame_stats) > FRAME_STATS_CACHE_SIZE:
+                self._frame_stats.popitem(last=False)
+        return stats
+    
     @staticmethod
     def convert_numpy_types(obj):
         """Convert NumPy types to native Python types for JSON serialization."""
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.bool_):
-            return bool(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {key: DataAnalysisService.convert_numpy_types(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [DataAnalysisService.convert_numpy_types(item) for item in obj]
-        else:
-            return obj
+        # orjson's C serializer handles NumPy scalars and arrays natively
+        return orjson.loads(orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS, default=str
+        ))
+    
+    @staticmethod
+    def dataframe_to_records(df: pd.DataFrame, fill_value: Any = "") -> List[Dict[str, Any]]:
+        """
+        Convert a DataFrame to JSON-safe records (native Python types, floats at
+        full precision, timestamps as ISO strings, missing values replaced by
+        fill_value, or None when fill_value is None) with one orjson round trip
+        instead of to_dict() followed by convert_numpy_types().
+        """
+        if df.empty:
+            return []
+        
+        # Only copy the frame to fill missing values when there are any, and
+        # only touch those columns
+        if fill_value is not None:
+            has_missing = df.isna().any()
+            if has_missing.any():
+                missing_cols = has_missing.index[has_missing]
+                # Datetime columns keep NaT when filled and categorical columns
+                # reject values outside their categories, so fill both as objects
+                df = df.astype({
+                    col: object for col in missing_cols
+                    if df[col].dtype.kind in "mM" or isinstance(df[col].dtype, pd.CategoricalDtype)
+                }).fillna({col: fill_value for col in missing_cols})
+        
+        records = df.to_dict(orient="records")
+        return orjson.loads(orjson.dumps(records, default=json_default, option=RECORD_JSON_OPTIONS))
     
     def analyze_data_quality(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze data quality metrics."""
         if df.empty:
             return {}
         
+        frame_stats = self.frame_stats(df)
+        null_counts = frame_stats.null_counts
+        total_nulls = int(null_counts.values.sum())
+        
         metrics = {
             "total_rows": int(len(df)),
             "total_columns": int(len(df.columns)),
-            "missing_values": {col: int(count) for col, count in df.isnull().sum().to_dict().items()},
-            "data_types": {col: str(dtype) for col, dtype in df.dtypes.to_dict().items()},
-            "unique_counts": {col: int(count) for col, count in df.nunique().to_dict().items()},
-            "memory_usage": int(df.memory_usage(deep=True).sum()),
-            "quality_score": float(round((1 - df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100, 2)) if len(df) > 0 else 0.0
+            "missing_values": {col: int(count) for col, count in null_counts.items()},
+            "data_types": {col: str(dtype) for col, dtype in df.dtypes.items()},
+            "unique_counts": {col: int(count) for col, count in frame_stats.unique_counts.items()},
+            "memory_usage": frame_stats.memory_usage,
+            "quality_score": float(round((1 - total_nulls / df.size) * 100, 2)) if len(df) > 0 else 0.0
         }
         
-        return self.convert_numpy_types(metrics)
+        # Every value above is already a native Python type
+        return metrics
     
     def analyze_column_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Get detailed statistics for each column"""
@@ -51,57 +169,119 @@ class DataAnalysisService:
             return {}
         
         stats = {}
+        frame_stats = self.frame_stats(df)
+        unique_counts = frame_stats.unique_counts
+        non_null_counts = frame_stats.non_null_counts
+        null_counts = frame_stats.null_counts
+        null_percentages = (null_counts / len(df) * 100).round(2)
+        # Null checks are settled once per frame, not re-scanned per column
+        has_values = (non_null_counts > 0).to_dict()
+        
+        # Each statistic is computed across all columns of a kind at once
+        num_cols = [col for col, dtype in df.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+        numeric_set = set(num_cols)
+        str_cols = [col for col in df.columns if col not in numeric_set]
+        
+        if num_cols and str_cols and df.size >= PARALLEL_STATS_MIN_CELLS and _CPU_COUNT > 1:
+            # NumPy reductions release the GIL, so the numeric pass overlaps
+            # with the (GIL-bound) text pass
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                numeric_future = pool.submit(self._numeric_statistics, df[num_cols])
+                lengths, first_modes = self._text_statistics(df[str_cols])
+                numeric_stats = numeric_future.result()
+        else:
+            if num_cols:
+                numeric_stats = self._numeric_statistics(df[num_cols])
+            if str_cols:
+                lengths, first_modes = self._text_statistics(df[str_cols])
+        # Plain dicts avoid building a Series per column lookup
+        numeric_rows = numeric_stats.to_dict("index") if num_cols else {}
+        length_rows = lengths.to_dict() if str_cols else {}
         
         for col in df.columns:
             col_data = df[col]
             col_stats = {
                 "name": col,
                 "dtype": str(col_data.dtype),
-                "count": int(col_data.count()),
-                "null_count": int(col_data.isnull().sum()),
-                "null_percentage": float(round((col_data.isnull().sum() / len(df)) * 100, 2)),
-                "unique_count": int(col_data.nunique())
+                "count": int(non_null_counts[col]),
+                "null_count": int(null_counts[col]),
+                "null_percentage": float(null_percentages[col]),
+                "unique_count": int(unique_counts[col])
             }
+            col_has_values = has_values[col]
             
             # Numeric statistics
-            if pd.api.types.is_numeric_dtype(col_data):
+            if col in numeric_set:
                 col_stats.update({
-                    "mean": float(col_data.mean()) if not col_data.isna().all() else None,
-                    "median": float(col_data.median()) if not col_data.isna().all() else None,
-                    "std": float(col_data.std()) if not col_data.isna().all() else None,
-                    "min": float(col_data.min()) if not col_data.isna().all() else None,
-                    "max": float(col_data.max()) if not col_data.isna().all() else None,
-                    "q25": float(col_data.quantile(0.25)) if not col_data.isna().all() else None,
-                    "q75": float(col_data.quantile(0.75)) if not col_data.isna().all() else None
+                    name: float(value) if col_has_values else None
+                    for name, value in numeric_rows[col].items()
                 })
             else:
                 # String statistics
+                most_common = first_modes[col]
+                col_lengths = length_rows[col]
                 col_stats.update({
-                    "most_common": str(col_data.mode()[0]) if len(col_data.mode()) > 0 else None,
-                    "max_length": int(col_data.astype(str).str.len().max()) if not col_data.isna().all() else 0,
-                    "min_length": int(col_data.astype(str).str.len().min()) if not col_data.isna().all() else 0,
-                    "avg_length": float(col_data.astype(str).str.len().mean()) if not col_data.isna().all() else 0
+                    "most_common": None if pd.isna(most_common) else str(most_common),
+                    "max_length": int(col_lengths["max"]) if col_has_values else 0,
+                    "min_length": int(col_lengths["min"]) if col_has_values else 0,
+                    "avg_length": float(col_lengths["mean"]) if col_has_values else 0
                 })
                 
                 # Add top values for categorical data
-                if col_data.nunique() <= 20:
-                    top_values = col_data.value_counts().head(10)
+                if unique_counts[col] <= 20:
+                    # Partial selection of the ten largest counts; ties rank by first appearance
+                    top_values = col_data.value_counts(sort=False).nlargest(10)
                     col_stats["top_values"] = [
                         {"value": str(val), "count": int(count)} 
                         for val, count in top_values.items()
                     ]
             
-            stats[col] = self.convert_numpy_types(col_stats)
+            stats[col] = col_stats
         
         return stats
     
+    @staticmethod
+    def _numeric_statistics(numeric: pd.DataFrame) -> pd.DataFrame:
+        """Summary statistics of numeric columns, one row per column"""
+        # Booleans have no quantiles of their own, so summarize them as 0/1
+        numeric = numeric.astype({col: float for col, dtype in numeric.dtypes.items() if dtype.kind == "b"})
+        quantiles = numeric.quantile([0.25, 0.75])
+        return pd.DataFrame({
+            "mean": numeric.mean(),
+            "median": numeric.median(),
+            "std": numeric.std(),
+            "min": numeric.min(),
+            "max": numeric.max(),
+            "q25": quantiles.loc[0.25],
+            "q75": quantiles.loc[0.75]
+        })
+    
+    @staticmethod
+    def _rendered_lengths(values: pd.Series) -> pd.Series:
+        """Length of each value as str() renders it"""
+        if isinstance(values.dtype, pd.StringDtype):
+            # String kernels measure in place; missing values render as "nan"
+            return values.str.len().fillna(len("nan"))
+        return values.astype(str).str.len()
+    
+    @staticmethod
+    def _text_statistics(text: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+        """Rendered length max/min/mean and first mode of text columns"""
+        lengths = text.apply(DataAnalysisService._rendered_lengths).agg(["max", "min", "mean"])
+        modes = text.mode()
+        first_modes = modes.iloc[0] if len(modes) else pd.Series(index=text.columns, dtype=object)
+        return lengths, first_modes
+    
     def generate_data_recommendations(self, df: pd.DataFrame, data_quality: Dict) -> List[str]:
         """Generate recommendations based on data analysis"""
         recommendations = []
+        # Column filters below are masks over the frame's cached aggregates
+        frame_stats = self.frame_stats(df)
+        null_counts = frame_stats.null_counts
+        unique_counts = frame_stats.unique_counts
         
         # Check for missing data
-        missing_data = data_quality.get('missing_values', {})
-        high_missing = [col for col, count in missing_data.items() if count > len(df) * 0.1]
+        high_missing = null_counts.index[null_counts > len(df) * 0.1].tolist()
         if high_missing:
             recommendations.append({
                 "type": "warning",
@@ -111,8 +291,7 @@ class DataAnalysisService:
             })
         
         # Check for low cardinality
-        unique_counts = data_quality.get('unique_counts', {})
-        low_cardinality = [col for col, count in unique_counts.items() if count == 1]
+        low_cardinality = unique_counts.index[unique_counts == 1].tolist()
         if low_cardinality:
             recommendations.append({
                 "type": "warning", 
@@ -133,11 +312,10 @@ class DataAnalysisService:
         
         # Check for high cardinality string columns
         high_cardinality = []
-        for col in df.columns:
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                unique_ratio = df[col].nunique() / len(df)
-                if unique_ratio > 0.95 and len(df) > 100:
-                    high_cardinality.append(col)
+        if len(df) > 100:
+            text_cols = [col for col, dtype in df.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)]
+            unique_ratios = unique_counts[text_cols] / len(df)
+            high_cardinality = unique_ratios.index[unique_ratios > 0.95].tolist()
         
         if high_cardinality:
             recommendations.append({
@@ -178,23 +356,18 @@ class DataAnalysisService:
         if df.empty:
             return {}
         
-        services = []
         columns = [col.lower() for col in df.columns]
         
         # Service detection based on column patterns
-        service_patterns = {
-            "Customer Service": ["customer", "cust", "client"],
-            "Employee Service": ["employee", "emp", "staff", "worker"],
-            "Product Service": ["product", "item", "part", "inventory"],
-            "Order Service": ["order", "transaction", "sale", "purchase"],
-            "Payment Service": ["payment", "billing", "invoice", "amount"],
-            "Address Service": ["address", "location", "city", "state", "zip"],
-            "User Service": ["user", "login", "auth", "account"]
-        }
-        
-        for service_name, patterns in service_patterns.items():
-            if any(pattern in col for col in columns for pattern in patterns):
-                services.append(service_name)
+        if _SERVICE_AUTOMATON is not None:
+            # One scan of each column name finds every keyword it contains
+            found = {service_name for col in columns for _, service_name in _SERVICE_AUTOMATON.iter(col)}
+            services = [service_name for service_name in SERVICE_PATTERNS if service_name in found]
+        else:
+            services = [
+                service_name for service_name, patterns in SERVICE_PATTERNS.items()
+                if any(pattern in col for col in columns for pattern in patterns)
+            ]
         
         # Default service if no patterns match
         if not services:
@@ -1,31 +1,189 @@
 # services/file_service.py - Enhanced File Processing Service
 import pandas as pd
+import numpy as np
+import codecs
+import hashlib
 import io
 import csv
-import chardet
 import logging
 import re
 import json
-from typing import Optional, Tuple, List, Any, Dict
+import orjson
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Iterator, Optional, Tuple, List, Any, Dict
 from fastapi import HTTPException, UploadFile
+from core.config import settings
+
+# Prefer the C++ uchardet bindings for encoding detection, fall back to chardet
+try:
+    import cchardet as charset_detector
+    HAS_CCHARDET = True
+except ImportError:
+    import chardet as charset_detector
+    HAS_CCHARDET = False
+
+# Polars' multi-threaded CSV reader (optional, enable with USE_POLARS)
+try:
+    import polars as pl
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+# JIT-compiled fixed-width slicing (optional, falls back to NumPy)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Arrow-backed string columns (optional, enable with ARROW_STRINGS)
+try:
+    import pyarrow  # noqa: F401 - registers the "string[pyarrow]" dtype
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 # Import the AI service
 from services.ai_service import ai_service
+from services.data_analysis_service import DataAnalysisService, data_service, json_default, RECORD_JSON_OPTIONS
 
 logger = logging.getLogger(__name__)
 
+# Encoding detection samples this many leading bytes of an upload (and reads
+# the rest in chunks of this size when checking it is UTF-8 throughout)
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# Rows encoded per chunk when streaming NDJSON and JSON exports
+NDJSON_CHUNK_ROWS = 10_000
+
+# Text layouts are recognized by a hash of this many leading characters (the
+# delimiter sniffer's sample), remembering the most recent LAYOUT_CACHE_SIZE
+LAYOUT_SAMPLE_CHARS = 8192
+LAYOUT_CACHE_SIZE = 128
+_layout_cache: "OrderedDict[bytes, Tuple[str, Optional[str]]]" = OrderedDict()
+_layout_cache_lock = threading.Lock()
+
+def _cached_layout(signature: bytes) -> Optional[Tuple[str, Optional[str]]]:
+    """Layout detected earlier for a file with this leading sample, if any"""
+    with _layout_cache_lock:
+        layout = _layout_cache.get(signature)
+        if layout is not None:
+            _layout_cache.move_to_end(signature)
+        return layout
+
+def _remember_layout(signature: bytes, layout: Tuple[str, Optional[str]]) -> None:
+    with _layout_cache_lock:
+        _layout_cache[signature] = layout
+        _layout_cache.move_to_end(signature)
+        while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+
+# Text columns with fewer distinct values than this share of rows become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+# Numeric-looking text with a leading zero (account codes, ZIPs) must stay text
+_LEADING_ZERO_RE = re.compile(r'^\s*[-+]?0\d')
+# Text columns are stored contiguously in Arrow buffers under ARROW_STRINGS
+ARROW_STRING_DTYPE = "string[pyarrow]"
+
+# ASCII bytes that str.strip() removes, as a lookup table over byte values
+_ASCII_WHITESPACE = np.zeros(256, dtype=bool)
+_ASCII_WHITESPACE[[0x09, 0x0a, 0x0b, 0x0c, 0x0d, 0x1c, 0x1d, 0x1e, 0x1f, 0x20]] = True
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _strip_span(buf, line_starts, line_lengths, start, end, whitespace):
+        """
+        Copy the stripped [start, end) span of every line in buf into a
+        rows x (end - start) matrix, left-aligned and NUL-padded
+        """
+        out = np.zeros((line_starts.shape[0], end - start), dtype=np.uint8)
+        for row in range(line_starts.shape[0]):
+            lo = line_starts[row] + start
+            hi = line_starts[row] + min(end, line_lengths[row])
+            while lo < hi and whitespace[buf[lo]]:
+                lo += 1
+            while hi > lo and whitespace[buf[hi - 1]]:
+                hi -= 1
+            for k in range(hi - lo):
+                out[row, k] = buf[lo + k]
+        return out
+
+# Report layout patterns, compiled once. The line patterns are used with
+# fullmatch() on raw lines and allow surrounding whitespace themselves, so
+# no stripped copy of each line is needed
+_SEPARATOR_RE = re.compile(r'\s*[-=][-=\s]*')
+_BLANK_OR_SEPARATOR_RE = re.compile(r'[-=\s]*')
+_HAS_LETTER_RE = re.compile(r'[A-Za-z]')
+_HEADER_RE = re.compile(r'^[A-Z][A-Z0-9\s]{10,}')
+_UPPERCASE_LINE_RE = re.compile(r'\s*[A-Z][A-Z0-9\s]*')
+_WORD_RE = re.compile(r'\S+')
+
 class FileProcessingService:
     """Enhanced service for processing uploaded files with better AS/400 support"""
 
     @staticmethod
-    def safe_decode(raw_bytes: bytes) -> str:
-        """Detect encoding and decode bytes to string."""
+    def detect_encoding(upload: BinaryIO) -> str:
+        """Detect the encoding of an upload from its leading bytes."""
+        upload.seek(0)
+        sample = upload.read(ENCODING_SAMPLE_BYTES)
         try:
-            detect = chardet.detect(raw_bytes)
-            enc = detect.get("encoding") or "utf-8"
-            return raw_bytes.decode(enc, errors="ignore")
+            if not sample.isascii():
+                enc = charset_detector.detect(sample).get("encoding")
+                if enc and codecs.lookup(enc).name not in ("ascii", "utf-8"):
+                    return codecs.lookup(enc).name
+            
+            # An ASCII or UTF-8 prefix says nothing about the rest of the file,
+            # so UTF-8 is only chosen when the whole upload decodes as UTF-8
+            invalid_chunk = FileProcessingService._first_non_utf8_chunk(upload)
+            if invalid_chunk is None:
+                return "utf-8"
+            enc = charset_detector.detect(invalid_chunk).get("encoding")
+            if not enc or codecs.lookup(enc).name in ("ascii", "utf-8"):
+                return "cp1252"
+            return codecs.lookup(enc).name
         except Exception:
-            return raw_bytes.decode("utf-8", errors="ignore")
+            return "utf-8"
+        finally:
+            upload.seek(0)
+
+    @staticmethod
+    def _first_non_utf8_chunk(upload: BinaryIO) -> Optional[bytes]:
+        """First chunk of the upload that is not valid UTF-8, or None if all of it is"""
+        upload.seek(0)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        while True:
+            chunk = upload.read(ENCODING_SAMPLE_BYTES)
+            if not chunk:
+                return None
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError:
+                return chunk
+
+    @staticmethod
+    def open_text(upload: BinaryIO, encoding: str) -> io.TextIOWrapper:
+        """
+        Decode an upload incrementally from the start. Callers detach() the
+        wrapper when done so the upload itself stays open.
+        """
+        upload.seek(0)
+        return io.TextIOWrapper(upload, encoding=encoding, errors="ignore", newline="")
+
+    @staticmethod
+    def read_csv_polars(upload: BinaryIO) -> pd.DataFrame:
+        """Parse a UTF-8 CSV upload with Polars and hand it back as a pandas frame"""
+        upload.seek(0)
+        frame = pl.read_csv(upload, infer_schema_length=10000)
+        # Column-wise NumPy conversion avoids needing pyarrow for to_pandas()
+        columns = {}
+        for name in frame.columns:
+            values = pd.Series(frame.get_column(name).to_numpy())
+            if values.dtype == object:
+                # pandas marks missing text as NaN where Polars gives None
+                values = values.where(values.notna(), float("nan"))
+            columns[name] = values
+        return pd.DataFrame(columns)
 
     @staticmethod
     def detect_fixed_width_structure(lines: List[str]) -> Optional[List[tuple]]:
@@ -43,11 +201,11 @@ class FileProcessingService:
         # Common AS/400 report patterns
         for i, line in enumerate(lines[:5]):
             # Skip empty lines and separator lines (dashes, equals)
-            if not line.strip() or re.match(r'^[-=\s]+$', line.strip()):
+            if _BLANK_OR_SEPARATOR_RE.fullmatch(line):
                 continue
                 
             # Look for lines with mixed alphanumeric content (likely headers)
-            if re.search(r'[A-Za-z]', line) and not line.strip().startswith(('Page', 'Date', 'Time')):
+            if _HAS_LETTER_RE.search(line) and not line.strip().startswith(('Page', 'Date', 'Time')):
                 if header_line is None:
                     header_line = line
                     header_line_idx = i
@@ -59,30 +217,66 @@ class FileProcessingService:
         if not header_line:
             return None
             
-        # Extract column positions based on header spacing
-        columns = []
-        words = []
-        current_word = ""
-        start_pos = 0
-        
-        # Parse header to find column boundaries
-        for pos, char in enumerate(header_line):
-            if char.isspace():
-                if current_word:
-                    words.append((start_pos, pos, current_word.strip()))
-                    current_word = ""
-                    start_pos = pos + 1
-                else:
-                    start_pos = pos + 1
-            else:
-                current_word += char
-        
-        # Add the last word
-        if current_word:
-            words.append((start_pos, len(header_line), current_word.strip()))
+        # Extract column positions based on header spacing: each
+        # whitespace-separated word spans one column
+        words = [(m.start(), m.end(), m.group()) for m in _WORD_RE.finditer(header_line)]
         
         return words if len(words) > 1 else None
 
+    @staticmethod
+    def _slice_fixed_width(lines: List[str], spans: List[Tuple[int, int]]) -> Dict[int, pd.Series]:
+        """
+        Cut each (start, end) span out of every line and strip it. Positions
+        past the end of a short line read as empty.
+        """
+        joined = "".join(lines)
+        if not joined.isascii() or "\x00" in joined:
+            # Character offsets only match byte offsets for ASCII; NUL is the
+            # padding byte of the matrix below
+            text = pd.Series(lines, dtype=object)
+            return {i: text.str.slice(start, end).str.strip() for i, (start, end) in enumerate(spans)}
+        
+        if HAS_NUMBA:
+            # Walk the unpadded text once per span in compiled code
+            buf = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+            line_lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+            line_starts = np.cumsum(line_lengths) - line_lengths
+            columns = {}
+            for i, (start, end) in enumerate(spans):
+                if end <= start:
+                    columns[i] = pd.Series([""] * len(lines), dtype=object)
+                    continue
+                cells = _strip_span(buf, line_starts, line_lengths, start, end, _ASCII_WHITESPACE)
+                columns[i] = pd.Series(cells.view(f"S{end - start}").ravel().astype(str).astype(object))
+            return columns
+        
+        # Lay the lines out as a rows x width byte matrix and cut columns as views
+        width = max(map(len, lines))
+        matrix = np.frombuffer(
+            "".join(line.ljust(width) for line in lines).encode("ascii"), dtype=np.uint8
+        ).reshape(len(lines), width)
+        
+        columns = {}
+        for i, (start, end) in enumerate(spans):
+            block = matrix[:, start:end]
+            span_width = block.shape[1]
+            if span_width == 0:
+                columns[i] = pd.Series([""] * len(lines), dtype=object)
+                continue
+            
+            # Strip by shifting each cell left past its leading whitespace and
+            # zeroing everything after its last non-whitespace byte; the
+            # fixed-size bytes dtype drops trailing NULs
+            keep = ~_ASCII_WHITESPACE[block]
+            has_text = keep.any(axis=1)
+            lead = np.where(has_text, keep.argmax(axis=1), span_width)
+            length = np.where(has_text, span_width - keep[:, ::-1].argmax(axis=1) - lead, 0)
+            positions = np.arange(span_width)
+            cells = np.take_along_axis(block, np.minimum(lead[:, None] + positions, span_width - 1), axis=1)
+            cells[positions >= length[:, None]] = 0
+            columns[i] = pd.Series(cells.view(f"S{span_width}").ravel().astype(str).astype(object))
+        return columns
+
     @staticmethod
     def parse_fixed_width_data(content_str: str) -> pd.DataFrame:
         """
@@ -91,7 +285,7 @@ class FileProcessingService:
         lines = content_str.strip().split('\n')
         
         # Remove empty lines
-        lines = [line for line in lines if line.strip()]
+        lines = [line for line in lines if line and not line.isspace()]
         
         if len(lines) < 2:
             raise ValueError("Insufficient data for fixed-width parsing")
@@ -102,15 +296,14 @@ class FileProcessingService:
         if column_structure:
             # Use detected structure
             columns = []
-            data_rows = []
             
             # Find where actual data starts (skip headers and separators)
             data_start = 0
             for i, line in enumerate(lines):
-                if re.match(r'^[-=\s]+$', line.strip()):
+                if _SEPARATOR_RE.fullmatch(line):
                     data_start = i + 1
                     break
-                elif i > 0 and not re.search(r'^[A-Z][A-Z0-9\s]*$', line.strip()):
+                elif i > 0 and not _UPPERCASE_LINE_RE.fullmatch(line):
                     data_start = i
                     break
             
@@ -118,27 +311,22 @@ class FileProcessingService:
             for start, end, name in column_structure:
                 columns.append(name)
             
-            # Extract data using fixed positions
-            for line in lines[max(data_start, 1):]:
-                if not line.strip() or re.match(r'^[-=\s]*$', line.strip()):
-                    continue
-                    
-                row = []
-                for start, end, _ in column_structure:
-                    # Safely extract text within bounds
-                    if start < len(line):
-                        cell_value = line[start:min(end, len(line))].strip()
-                        row.append(cell_value if cell_value else "")
-                    else:
-                        row.append("")
-                
-                if any(cell for cell in row):  # Skip completely empty rows
-                    data_rows.append(row)
+            # Data lines, without blank and separator lines
+            data_lines = [
+                line for line in lines[max(data_start, 1):]
+                if not _BLANK_OR_SEPARATOR_RE.fullmatch(line)
+            ]
             
-            if data_rows:
-                df = pd.DataFrame(data_rows, columns=columns)
-                logger.info(f"Fixed-width parsing successful: {df.shape}")
-                return df
+            if data_lines:
+                spans = [(start, end) for start, end, _ in column_structure]
+                df = pd.DataFrame(FileProcessingService._slice_fixed_width(data_lines, spans))
+                df.columns = columns
+                
+                # Skip completely empty rows
+                df = df[(df != "").any(axis=1)].reset_index(drop=True)
+                if not df.empty:
+                    logger.info(f"Fixed-width parsing successful: {df.shape}")
+                    return df
         
         # Fallback to pandas read_fwf
         try:
@@ -151,34 +339,98 @@ class FileProcessingService:
         
         raise ValueError("Could not parse as fixed-width format")
 
+    @staticmethod
+    def _read_delimited(content_str: str, delimiter: str) -> Optional[pd.DataFrame]:
+        """Parse with one delimiter; None unless it yields a multi-column table"""
+        try:
+            df = pd.read_csv(io.StringIO(content_str), sep=delimiter, engine="c")
+        except Exception:
+            return None
+        return df if df.shape[1] > 1 and len(df) > 0 else None
+
+    @staticmethod
+    def _read_whitespace_table(lines: List[str]) -> Optional[pd.DataFrame]:
+        """Split lines on whitespace, taking the first line as the header"""
+        header_line = lines[0]
+        data_lines = lines[1:] if len(lines) > 1 else []
+
+        # Simple heuristic for header detection
+        header_tokens = header_line.split()
+        is_header = any(not token.replace('.', '').replace('-', '').isdigit() for token in header_tokens)
+
+        if is_header and data_lines:
+            headers = header_tokens
+            rows = []
+            for line in data_lines:
+                tokens = line.split()
+                while len(tokens) < len(headers):
+                    tokens.append("")
+                rows.append(tokens[:len(headers)])
+            
+            if rows:
+                return pd.DataFrame(rows, columns=headers)
+        return None
+
+    @staticmethod
+    def _read_with_layout(content_str: str, layout: Tuple[str, Optional[str]]) -> Optional[pd.DataFrame]:
+        """Parse with a previously detected layout; None if it no longer fits"""
+        kind, delimiter = layout
+        if kind == "fixed_width":
+            try:
+                return FileProcessingService.parse_fixed_width_data(content_str)
+            except Exception:
+                return None
+        if kind == "delimited":
+            return FileProcessingService._read_delimited(content_str, delimiter)
+        lines = [line for line in content_str.splitlines() if line and not line.isspace()]
+        return FileProcessingService._read_whitespace_table(lines) if lines else None
+
     @staticmethod
     def detect_delimiter_and_read_text(content_str: str) -> pd.DataFrame:
         """
-        Enhanced text file parsing with strong AS/400 fixed-width support
+        Enhanced text file parsing with strong AS/400 fixed-width support.
+        Repeat uploads of a known report layout skip detection.
         """
+        signature = hashlib.blake2b(
+            content_str[:LAYOUT_SAMPLE_CHARS].encode("utf-8", errors="replace"), digest_size=16
+        ).digest()
+        layout = _cached_layout(signature)
+        if layout is not None:
+            df = FileProcessingService._read_with_layout(content_str, layout)
+            if df is not None:
+                logger.info(f"Parsed with cached {layout[0]} layout: {df.shape}")
+                return df
+        
+        df, layout = FileProcessingService._detect_and_read_text(content_str)
+        _remember_layout(signature, layout)
+        return df
+
+    @staticmethod
+    def _detect_and_read_text(content_str: str) -> Tuple[pd.DataFrame, Tuple[str, Optional[str]]]:
+        """Detect the layout of a text file and parse it, returning both"""
         # First, try to detect if this is a fixed-width format
-        lines = [line for line in content_str.splitlines() if line.strip()]
+        lines = [line for line in content_str.splitlines() if line and not line.isspace()]
         
         if len(lines) >= 3:
             # Check for AS/400 report characteristics
             has_uniform_width = len(set(len(line) for line in lines[:10])) <= 2
             has_header_pattern = any(
-                re.search(r'^[A-Z][A-Z0-9\s]{10,}', line) 
+                _HEADER_RE.search(line) 
                 for line in lines[:3]
             )
             has_separator_line = any(
-                re.match(r'^[-=\s]+$', line.strip()) 
+                _SEPARATOR_RE.fullmatch(line) 
                 for line in lines[:5]
             )
             
             if has_uniform_width or has_header_pattern or has_separator_line:
                 try:
-                    return FileProcessingService.parse_fixed_width_data(content_str)
+                    return FileProcessingService.parse_fixed_width_data(content_str), ("fixed_width", None)
                 except Exception as e:
                     logger.warning(f"Fixed-width parsing failed: {e}")
         
         # Standard CSV/delimited parsing fallback
-        sample = content_str[:8192]
+        sample = content_str[:LAYOUT_SAMPLE_CHARS]
         delimiter = None
         
         try:
@@ -191,55 +443,35 @@ class FileProcessingService:
         
         # Try detected delimiter first
         if delimiter:
-            try:
-                df = pd.read_csv(io.StringIO(content_str), sep=delimiter, engine="python")
-                if df.shape[1] > 1 and len(df) > 0:
-                    logger.info(f"Successfully parsed with delimiter '{delimiter}': {df.shape}")
-                    return df
-            except Exception as e:
-                logger.warning(f"Failed to parse with detected delimiter '{delimiter}': {e}")
+            df = FileProcessingService._read_delimited(content_str, delimiter)
+            if df is not None:
+                logger.info(f"Successfully parsed with delimiter '{delimiter}': {df.shape}")
+                return df, ("delimited", delimiter)
+            logger.warning(f"Failed to parse with detected delimiter '{delimiter}'")
 
         # Try common delimiters
         delimiters_to_try = [',', '\t', '|', ';', ' ']
         for delim in delimiters_to_try:
-            try:
-                df = pd.read_csv(io.StringIO(content_str), sep=delim, engine="python")
-                if df.shape[1] > 1 and len(df) > 0:
-                    logger.info(f"Successfully parsed with '{delim}': {df.shape}")
-                    return df
-            except Exception:
-                continue
+            df = FileProcessingService._read_delimited(content_str, delim)
+            if df is not None:
+                logger.info(f"Successfully parsed with '{delim}': {df.shape}")
+                return df, ("delimited", delim)
 
         # Manual parsing as last resort
         if not lines:
             raise ValueError("No data found in file")
 
-        header_line = lines[0]
-        data_lines = lines[1:] if len(lines) > 1 else []
-
-        # Simple heuristic for header detection
-        header_tokens = header_line.split()
-        is_header = any(not token.replace('.', '').replace('-', '').isdigit() for token in header_tokens)
-
-        if is_header and data_lines:
-            headers = header_tokens
-            rows = []
-            for line in data_lines:
-                tokens = line.split()
-                while len(tokens) < len(headers):
-                    tokens.append("")
-                rows.append(tokens[:len(headers)])
-            
-            if rows:
-                df = pd.DataFrame(rows, columns=headers)
-                logger.info(f"Manual parsing successful: {df.shape}")
-                return df
+        df = FileProcessingService._read_whitespace_table(lines)
+        if df is not None:
+            logger.info(f"Manual parsing successful: {df.shape}")
+            return df, ("whitespace", None)
 
         raise ValueError("Unable to parse text file into tabular structure")
 
     def _modernize_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
         """Modernize column names with validation"""
         modernized_columns = []
+        named_columns = {}
         
         for i, col_name in enumerate(df.columns):
             original_col = str(col_name).strip()
@@ -248,62 +480,93 @@ class FileProcessingService:
                 column_data = df.iloc[:, i].dropna().astype(str).tolist()
                 new_name = ai_service.predict_column_name_from_data(column_data, i)
             else:
-                new_name = ai_service.modernize_column_name(original_col)
+                # Named columns are modernized together below
+                named_columns[i] = original_col
+                new_name = None
             
+            modernized_columns.append(new_name)
+        
+        if named_columns:
+            new_names = ai_service.modernize_columns_batch(list(named_columns.values()))
+            for i, new_name in zip(named_columns, new_names):
+                modernized_columns[i] = new_name
+        
+        for i, new_name in enumerate(modernized_columns):
             # Final validation
             if not new_name or len(new_name) < 2:
-                new_name = f"column_{i}"
-                
-            modernized_columns.append(new_name)
+                modernized_columns[i] = f"column_{i}"
+        
+        # Different source names can modernize to the same name (CUSTNO and
+        # "Cust No"); number the repeats so every column stays addressable
+        seen = set()
+        for i, new_name in enumerate(modernized_columns):
+            unique_name, n = new_name, 1
+            while unique_name in seen:
+                n += 1
+                unique_name = f"{new_name}_{n}"
+            seen.add(unique_name)
+            modernized_columns[i] = unique_name
         
         df.columns = modernized_columns
         return df
 
+    def _json_export_sections(self, df: pd.DataFrame, file_info: dict) -> Tuple[Dict, Dict]:
+        """JSON export sections that precede and follow the data rows"""
+        # Column aggregates, shared with the analysis of the same frame
+        frame_stats = data_service.frame_stats(df)
+        non_null_counts = frame_stats.non_null_counts
+        unique_counts = frame_stats.unique_counts
+        
+        head = {
+            "metadata": {
+                "filename": file_info.get("filename"),
+                "size_bytes": file_info.get("size_bytes"),
+                "detected_format": file_info.get("detected_format"),
+                "rows_processed": len(df),
+                "columns_processed": len(df.columns),
+                "processing_timestamp": pd.Timestamp.now().isoformat(),
+                "ai_processing_enabled": file_info.get("ai_processing_enabled", False)
+            },
+            "schema": {
+                "columns": [
+                    {
+                        "name": col,
+                        "index": i,
+                        "data_type": str(df[col].dtype),
+                        "non_null_count": int(non_null_counts[col]),
+                        "null_count": int(len(df) - non_null_counts[col]),
+                        "unique_count": int(unique_counts[col])
+                    }
+                    for i, col in enumerate(df.columns)
+                ]
+            }
+        }
+        tail = {
+            "statistics": {
+                "total_rows": len(df),
+                "total_columns": len(df.columns),
+                "memory_usage_bytes": frame_stats.memory_usage,
+                "completeness_ratio": float(non_null_counts.sum() / (len(df) * len(df.columns)))
+            }
+        }
+        
+        # Add column mapping if available
+        if hasattr(file_info, 'original_columns') and hasattr(file_info, 'modernized_columns'):
+            tail["column_mapping"] = {
+                orig: modern for orig, modern in 
+                zip(file_info.get('original_columns', []), 
+                    file_info.get('modernized_columns', []))
+            }
+        
+        return head, tail
+
     def generate_json_export(self, df: pd.DataFrame, file_info: dict) -> Dict:
         """Generate JSON representation of the processed data"""
         try:
-            # Create comprehensive JSON structure
-            json_data = {
-                "metadata": {
-                    "filename": file_info.get("filename"),
-                    "size_bytes": file_info.get("size_bytes"),
-                    "detected_format": file_info.get("detected_format"),
-                    "rows_processed": len(df),
-                    "columns_processed": len(df.columns),
-                    "processing_timestamp": pd.Timestamp.now().isoformat(),
-                    "ai_processing_enabled": file_info.get("ai_processing_enabled", False)
-                },
-                "schema": {
-                    "columns": [
-                        {
-                            "name": col,
-                            "index": i,
-                            "data_type": str(df[col].dtype),
-                            "non_null_count": int(df[col].count()),
-                            "null_count": int(df[col].isnull().sum()),
-                            "unique_count": int(df[col].nunique())
-                        }
-                        for i, col in enumerate(df.columns)
-                    ]
-                },
-                "data": df.to_dict(orient="records"),
-                "statistics": {
-                    "total_rows": len(df),
-                    "total_columns": len(df.columns),
-                    "memory_usage_bytes": int(df.memory_usage(deep=True).sum()),
-                    "completeness_ratio": float(df.count().sum() / (len(df) * len(df.columns)))
-                }
-            }
-            
-            # Add column mapping if available
-            if hasattr(file_info, 'original_columns') and hasattr(file_info, 'modernized_columns'):
-                json_data["column_mapping"] = {
-                    orig: modern for orig, modern in 
-                    zip(file_info.get('original_columns', []), 
-                        file_info.get('modernized_columns', []))
-                }
-            
-            return json_data
+            head, tail = self._json_export_sections(df, file_info)
+            # pandas' C JSON writer yields native types (missing values as None)
+            data = DataAnalysisService.dataframe_to_records(df, fill_value=None)
+            return {**head, "data": data, **tail}
             
         except Exception as e:
             logger.error(f"JSON export generation failed: {e}")
@@ -313,6 +576,125 @@ class FileProcessingService:
                 "data": df.head(100).to_dict(orient="records") if not df.empty else []
             }
 
+    def stream_json_export(
+        self,
+        df: pd.DataFrame,
+        file_info: dict,
+        include_metadata: bool = True,
+        include_schema: bool = True,
+        chunk_rows: int = NDJSON_CHUNK_ROWS
+    ) -> Iterator[bytes]:
+        """
+        Encode the same document as generate_json_export piece by piece. Data
+        rows are encoded one slice at a time, so only a slice of them is ever
+        held as Python dicts.
+        """
+        excluded = set()
+        if not include_metadata:
+            excluded.update(("metadata", "statistics"))
+        if not include_schema:
+            excluded.update(("schema", "column_mapping"))
+        
+        # The summary sections are built before streaming starts, so their
+        # failures still surface before any bytes are sent
+        try:
+            head, tail = self._json_export_sections(df, file_info)
+        except Exception as e:
+            logger.error(f"JSON export generation failed: {e}")
+            head, tail = {"metadata": {"error": str(e)}}, {}
+            df = df.head(100)
+        
+        def encode_section(key: str, value: Any) -> bytes:
+            return json.dumps(key).encode("utf-8") + b":" + json.dumps(value, default=str).encode("utf-8")
+        
+        # Once streaming starts the 200 status is already sent, so the column
+        # check and the first slice run now, where a failure can still be reported
+        self.ensure_unique_columns(df)
+        # Strip each slice's own brackets and join slices with commas
+        first_records = self._records_json(df.iloc[:chunk_rows])[1:-1] if len(df) else b""
+        
+        def chunks() -> Iterator[bytes]:
+            yield b"{" + b",".join(
+                encode_section(key, value) for key, value in head.items() if key not in excluded
+            )
+            yield (b"," if head.keys() - excluded else b"") + b'"data":[' + first_records
+            for start in range(chunk_rows, len(df), chunk_rows):
+                yield b"," + self._records_json(df.iloc[start:start + chunk_rows])[1:-1]
+            yield b"]"
+            for key, value in tail.items():
+                if key not in excluded:
+                    yield b"," + encode_section(key, value)
+            yield b"}"
+        
+        return chunks()
+
+    @staticmethod
+    def ensure_unique_columns(df: pd.DataFrame) -> None:
+        """Reject frames whose rows cannot be encoded as JSON records"""
+        if not df.columns.is_unique:
+            duplicates = sorted({str(col) for col in df.columns[df.columns.duplicated()]})
+            raise HTTPException(
+                status_code=422,
+                detail=f"Duplicate column names cannot be exported: {', '.join(duplicates)}"
+            )
+
+    @staticmethod
+    def _downcast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """Store columns in the smallest lossless dtype to cut memory and scan time"""
+        for col, dtype in df.dtypes.items():
+            if dtype.kind == "i":
+                df[col] = pd.to_numeric(df[col], downcast="integer")
+            elif dtype.kind == "u":
+                df[col] = pd.to_numeric(df[col], downcast="unsigned")
+            elif dtype == object:
+                values = df[col]
+                present = values.notna()
+                # Numeric text converts only when every value parses
+                numeric = pd.to_numeric(values, errors="coerce")
+                if (present.any() and numeric[present].notna().all()
+                        and not values[present].astype(str).str.match(_LEADING_ZERO_RE).any()):
+                    df[col] = pd.to_numeric(numeric, downcast="integer")
+                elif present.all() and values.nunique() < len(values) * CATEGORY_MAX_UNIQUE_RATIO:
+                    df[col] = values.astype("category")
+        return df
+
+    @staticmethod
+    def _arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+        """Move all-text object columns into Arrow string storage"""
+        for col, dtype in df.dtypes.items():
+            if dtype == object:
+                values = df[col]
+                present = values.dropna()
+                if len(present) and present.map(type).eq(str).all():
+                    df[col] = values.astype(ARROW_STRING_DTYPE)
+        return df
+
+    @staticmethod
+    def iter_ndjson(df: pd.DataFrame, chunk_rows: int = NDJSON_CHUNK_ROWS) -> Iterator[bytes]:
+        """
+        Encode df as newline-delimited JSON records, one slice of rows at a
+        time. The column check and the first slice run before the iterator is
+        returned, so their failures surface before a response starts streaming.
+        """
+        FileProcessingService.ensure_unique_columns(df)
+        first_records = FileProcessingService._records_json(df.iloc[:chunk_rows], lines=True)
+        
+        def chunks() -> Iterator[bytes]:
+            yield first_records
+            for start in range(chunk_rows, len(df), chunk_rows):
+                yield FileProcessingService._records_json(df.iloc[start:start + chunk_rows], lines=True)
+        
+        return chunks()
+
+    @staticmethod
+    def _records_json(df: pd.DataFrame, lines: bool = False) -> bytes:
+        """Rows of df as JSON records, floats kept at full precision"""
+        records = df.to_dict(orient="records")
+        if lines:
+            option = RECORD_JSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+            return b"".join(orjson.dumps(record, default=json_default, option=option) for record in records)
+        return orjson.dumps(records, default=json_default, option=RECORD_JSON_OPTIONS)
+
     async def process_file(self, file: UploadFile, export_format: str = "pandas") -> Tuple[pd.DataFrame, dict]:
         """
         Process uploaded file and return DataFrame with modernized column names
@@ -320,12 +702,16 @@ class FileProcessingService:
         Args:
             file: The uploaded file
             export_format: "pandas" or "json" - format for additional export
+                (streaming exports pass their own name to skip both)
         """
         try:
-            # Read and decode file
-            raw = await file.read()
-            text = self.safe_decode(raw)
-            logger.info(f"Processing file: {file.filename} ({len(raw)} bytes)")
+            # Detect the encoding and parse the spooled upload in place, so
+            # the whole file is never held as bytes and text at once
+            upload = file.file
+            encoding = self.detect_encoding(upload)
+            size_bytes = upload.seek(0, io.SEEK_END)
+            upload.seek(0)
+            logger.info(f"Processing file: {file.filename} ({size_bytes} bytes)")
 
             # Determine file type
             filename = (file.filename or "").lower()
@@ -334,7 +720,7 @@ class FileProcessingService:
             df = None
             file_info = {
                 "filename": file.filename,
-                "size_bytes": len(raw),
+                "size_bytes": size_bytes,
                 "detected_format": ext or "text",
                 "original_columns": [],
                 "modernized_columns": [],
@@ -344,21 +730,40 @@ class FileProcessingService:
             # Parse based on file extension
             if ext in ("xls", "xlsx"):
                 try:
-                    df = pd.read_excel(io.BytesIO(raw), engine='openpyxl')
+                    df = pd.read_excel(upload, engine='openpyxl')
                     logger.info(f"Excel file parsed: {df.shape}")
                 except Exception as e:
                     logger.error(f"Excel parsing failed: {e}")
                     raise HTTPException(status_code=400, detail=f"Could not read Excel file: {e}")
 
             elif ext == "csv":
-                try:
-                    df = pd.read_csv(io.StringIO(text), engine="python")
-                    logger.info(f"CSV parsed with pandas: {df.shape}")
-                except Exception:
-                    logger.info("Pandas CSV parsing failed, trying enhanced detection")
-                    df = self.detect_delimiter_and_read_text(text)
+                # Polars only reads UTF-8; anything it rejects goes through pandas
+                if HAS_POLARS and settings.USE_POLARS and encoding == "utf-8":
+                    try:
+                        df = self.read_csv_polars(upload)
+                        logger.info(f"CSV parsed with polars: {df.shape}")
+                    except Exception as e:
+                        logger.info(f"Polars CSV parsing failed: {e}")
+                
+                if df is None:
+                    stream = self.open_text(upload, encoding)
+                    try:
+                        df = pd.read_csv(stream, engine="c")
+                        logger.info(f"CSV parsed with pandas: {df.shape}")
+                    except Exception:
+                        logger.info("Pandas CSV parsing failed, trying enhanced detection")
+                        stream.seek(0)
+                        df = self.detect_delimiter_and_read_text(stream.read())
+                    finally:
+                        stream.detach()
 
             else:  # TXT or unknown - Enhanced for AS/400 fixed-width
+                # Layout detection looks at the whole report, so read it as text
+                stream = self.open_text(upload, encoding)
+                try:
+                    text = stream.read()
+                finally:
+                    stream.detach()
                 try:
                     df = self.detect_delimiter_and_read_text(text)
                     logger.info(f"Text file parsed: {df.shape}")
@@ -392,6 +797,12 @@ class FileProcessingService:
             # Modernize column names
             df = self._modernize_column_names(df)
             
+            # JSON exports keep the parsed dtypes so values round-trip unchanged
+            if settings.DOWNCAST_DTYPES and export_format == "pandas":
+                df = self._downcast_dtypes(df)
+            if HAS_PYARROW and settings.ARROW_STRINGS and export_format == "pandas":
+                df = self._arrow_strings(df)
+            
             # Store modernized column names
             file_info["modernized_columns"] = list(df.columns)
 
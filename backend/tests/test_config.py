@@ -0,0 +1,44 @@
+# tests/test_config.py - Settings tests
+import pytest
+
+from core.config import get_settings
+
+
+@pytest.fixture
+def fresh_settings():
+    """Build settings from the current environment, restoring the cached ones afterwards"""
+    get_settings.cache_clear()
+    yield get_settings
+    get_settings.cache_clear()
+
+
+def test_production_defaults(monkeypatch, fresh_settings):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    for name in ("DEBUG", "LOG_LEVEL", "AI_EAGER_LOAD", "ALLOWED_HOSTS"):
+        monkeypatch.delenv(name, raising=False)
+
+    settings = fresh_settings()
+
+    assert settings.DEBUG is False
+    assert settings.LOG_LEVEL == "WARNING"
+    assert settings.AI_EAGER_LOAD is True
+    # Hosts come from the environment, not from placeholder production defaults
+    assert settings.ALLOWED_HOSTS == ["*"]
+
+
+def test_environment_variables_override_environment_defaults(monkeypatch, fresh_settings):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    monkeypatch.setenv("DEBUG", "true")
+    monkeypatch.setenv("ALLOWED_HOSTS", '["api.example.com"]')
+
+    settings = fresh_settings()
+
+    assert settings.DEBUG is True
+    assert settings.ALLOWED_HOSTS == ["api.example.com"]
+
+
+def test_unknown_environment_uses_development_defaults(monkeypatch, fresh_settings):
+    monkeypatch.setenv("ENVIRONMENT", "staging")
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+
+    assert fresh_settings().LOG_LEVEL == "DEBUG"
@@ -0,0 +1,28 @@
+# tests/test_data_analysis.py - Data analysis service tests
+import numpy as np
+import pandas as pd
+
+from services.data_analysis_service import DataAnalysisService
+
+
+def test_records_keep_float_precision_and_iso_timestamps():
+    df = pd.DataFrame({
+        "amount": [0.1 + 0.2, np.nan],
+        "created": [pd.Timestamp("2024-01-01"), pd.NaT]
+    })
+
+    records = DataAnalysisService.dataframe_to_records(df)
+
+    assert records == [
+        {"amount": 0.30000000000000004, "created": "2024-01-01T00:00:00"},
+        {"amount": "", "created": ""}
+    ]
+    assert DataAnalysisService.dataframe_to_records(df, fill_value=None)[1] == {"amount": None, "created": None}
+
+
+def test_records_fill_missing_categorical_values():
+    df = pd.DataFrame({"status": pd.Categorical(["active", None, "active"])})
+
+    records = DataAnalysisService.dataframe_to_records(df)
+
+    assert [record["status"] for record in records] == ["active", "", "active"]
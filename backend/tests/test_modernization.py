@@ -0,0 +1,67 @@
+# tests/test_modernization.py - Modernization endpoint tests
+import itertools
+import json
+import re
+
+from fastapi.testclient import TestClient
+
+import main
+import services.code_generation_service as code_generation
+
+CSV_UPLOAD = b"CUSNO,CUSNAM,BALAMT\n1,Alpha,10.5\n2,Beta,20.0\n3,Gamma,30.25\n"
+
+
+def test_repeat_uploads_stamp_artifacts_with_their_own_request_time(monkeypatch):
+    """Artifacts reused across uploads of the same shape must not keep an old timestamp"""
+    stamps = (f"2024-01-01 00:00:{second:02d} UTC" for second in itertools.count())
+    monkeypatch.setattr(code_generation, "generation_timestamp", lambda: next(stamps))
+
+    seen = []
+    with TestClient(main.app) as client:
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/modernize",
+                files={"file": ("customers.csv", CSV_UPLOAD, "text/csv")}
+            )
+            assert response.status_code == 200
+            body = response.json()
+
+            created_on = re.search(r"-- Created on: (.+)", body["sql_schema"]).group(1)
+            generated_on = re.search(r"Generated on: (.+)", body["rest_api_code"]).group(1)
+            assert generated_on == created_on
+            seen.append(created_on)
+
+    assert seen[0] != seen[1]
+
+
+def test_export_endpoints_keep_client_errors():
+    """A 400 from process_file must not be reported as a server error"""
+    with TestClient(main.app) as client:
+        for path in ("/api/v1/export/json", "/api/v1/export/ndjson"):
+            response = client.post(path, files={"file": ("empty.txt", b"", "text/plain")})
+            assert response.status_code == 400
+
+        assert client.get("/api/v1/analyze/unknown").status_code == 404
+
+
+def test_exports_with_colliding_modernized_names_are_complete():
+    """Source columns that modernize to the same name still export every value"""
+    upload = b"CUSTNO,Cust No,AMT\n1,2,3.5\n4,5,6.25\n"
+    with TestClient(main.app) as client:
+        response = client.post("/api/v1/export/json", files={"file": ("dup.csv", upload, "text/csv")})
+        assert response.status_code == 200
+        rows = response.json()["data"]
+
+    assert len(rows) == 2
+    assert all(len(row) == 3 for row in rows)
+
+
+def test_ndjson_export_keeps_full_float_precision():
+    upload = b"ID,RATE\n1,0.1234567890123456\n2,0.5\n"
+    with TestClient(main.app) as client:
+        response = client.post("/api/v1/export/ndjson", files={"file": ("rates.csv", upload, "text/csv")})
+        assert response.status_code == 200
+
+    rates = [list(json.loads(line).values())[1] for line in response.text.splitlines()]
+    # 16 decimal places; an encoder capped at 15 would write 0.123456789012346
+    assert rates == [0.1234567890123456, 0.5]